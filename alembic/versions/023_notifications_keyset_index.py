@@ -0,0 +1,27 @@
+"""notifications keyset pagination index
+
+Revision ID: 023_notifications_keyset_index
+Revises: 022_user_profiles_language
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "023_notifications_keyset_index"
+down_revision = "022_user_profiles_language"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_notifications_recipient_created_id",
+        "notifications",
+        ["recipient_user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_notifications_recipient_created_id", table_name="notifications")
@@ -0,0 +1,36 @@
+"""chat_messages message_type/approval_status columns and thread index
+
+Revision ID: 024_chat_messages_type_columns
+Revises: 023_notifications_keyset_index
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+revision = "024_chat_messages_type_columns"
+down_revision = "023_notifications_keyset_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The model has carried these columns since chat approvals shipped; make the
+    # migration history match so fresh databases get them too.
+    op.execute("ALTER TABLE chat_messages ADD COLUMN IF NOT EXISTS message_type TEXT NOT NULL DEFAULT 'text'")
+    op.execute("ALTER TABLE chat_messages ADD COLUMN IF NOT EXISTS approval_status TEXT")
+    op.create_check_constraint(
+        "ck_chat_messages_approval_status_valid",
+        "chat_messages",
+        "approval_status IS NULL OR approval_status IN ('pending', 'approved', 'declined')",
+    )
+    op.create_index(
+        "ix_chat_messages_thread_created",
+        "chat_messages",
+        ["thread_id", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_chat_messages_thread_created", table_name="chat_messages")
+    op.drop_constraint("ck_chat_messages_approval_status_valid", "chat_messages", type_="check")
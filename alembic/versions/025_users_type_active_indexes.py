@@ -0,0 +1,23 @@
+"""users user_type / is_active indexes
+
+Revision ID: 025_users_type_active_indexes
+Revises: 024_chat_messages_type_columns
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+revision = "025_users_type_active_indexes"
+down_revision = "024_chat_messages_type_columns"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_users_user_type", "users", ["user_type"], unique=False)
+    op.create_index("ix_users_is_active", "users", ["is_active"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_is_active", table_name="users")
+    op.drop_index("ix_users_user_type", table_name="users")
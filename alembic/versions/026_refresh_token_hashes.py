@@ -0,0 +1,32 @@
+"""store refresh tokens as HMAC digests
+
+Revision ID: 026_refresh_token_hashes
+Revises: 025_users_type_active_indexes
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "026_refresh_token_hashes"
+down_revision = "025_users_type_active_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Stored plaintext tokens cannot be re-keyed here; outstanding sessions sign in again.
+    op.execute("DELETE FROM auth_refresh_tokens")
+    # Dropping the column also drops its unique constraint and index.
+    op.drop_column("auth_refresh_tokens", "token")
+    op.add_column("auth_refresh_tokens", sa.Column("token_hash", sa.LargeBinary(length=32), nullable=False))
+    op.create_index("ix_auth_refresh_tokens_token_hash", "auth_refresh_tokens", ["token_hash"], unique=True)
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM auth_refresh_tokens")
+    op.drop_index("ix_auth_refresh_tokens_token_hash", table_name="auth_refresh_tokens")
+    op.drop_column("auth_refresh_tokens", "token_hash")
+    op.add_column("auth_refresh_tokens", sa.Column("token", sa.String(), nullable=False))
+    op.create_unique_constraint("auth_refresh_tokens_token_key", "auth_refresh_tokens", ["token"])
+    op.create_index("ix_auth_refresh_tokens_token", "auth_refresh_tokens", ["token"])
@@ -0,0 +1,24 @@
+"""chat_thread_members (thread_id, user_id) lookup index
+
+Revision ID: 027_chat_thread_members_lookup_index
+Revises: 026_refresh_token_hashes
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+revision = "027_chat_thread_members_lookup_index"
+down_revision = "026_refresh_token_hashes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_chat_thread_members_thread_user "
+        "ON chat_thread_members (thread_id, user_id)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_chat_thread_members_thread_user")
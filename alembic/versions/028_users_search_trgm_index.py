@@ -0,0 +1,25 @@
+"""users trigram search index
+
+Revision ID: 028_users_search_trgm_index
+Revises: 027_chat_thread_members_lookup_index
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+revision = "028_users_search_trgm_index"
+down_revision = "027_chat_thread_members_lookup_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_users_search_trgm ON users USING gin "
+        "((first_name || ' ' || last_name || ' ' || username || ' ' || email) gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_users_search_trgm")
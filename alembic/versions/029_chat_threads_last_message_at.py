@@ -0,0 +1,34 @@
+"""chat_threads.last_message_at
+
+Revision ID: 029_chat_threads_last_message_at
+Revises: 028_users_search_trgm_index
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "029_chat_threads_last_message_at"
+down_revision = "028_users_search_trgm_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("chat_threads", sa.Column("last_message_at", sa.DateTime(timezone=True), nullable=True))
+    op.execute(
+        """
+        UPDATE chat_threads AS t
+        SET last_message_at = m.last_message_at
+        FROM (
+            SELECT thread_id, MAX(created_at) AS last_message_at
+            FROM chat_messages
+            GROUP BY thread_id
+        ) AS m
+        WHERE m.thread_id = t.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("chat_threads", "last_message_at")
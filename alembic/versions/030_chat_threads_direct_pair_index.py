@@ -0,0 +1,34 @@
+"""chat_threads: unique direct-thread pair index
+
+Revision ID: 030_chat_threads_direct_pair_index
+Revises: 029_chat_threads_last_message_at
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+revision = "030_chat_threads_direct_pair_index"
+down_revision = "029_chat_threads_last_message_at"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # is_group predates this chain on some databases; add it where missing.
+    op.execute("ALTER TABLE chat_threads ADD COLUMN IF NOT EXISTS is_group BOOLEAN NOT NULL DEFAULT FALSE")
+    # The old pair constraint also covered group threads, which reuse the member
+    # min/max in user_one_id/user_two_id; scope uniqueness to direct threads only.
+    op.execute("ALTER TABLE chat_threads DROP CONSTRAINT IF EXISTS uq_chat_threads_user_pair")
+    op.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_chat_threads_direct_pair "
+        "ON chat_threads (user_one_id, user_two_id) WHERE NOT is_group"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS uq_chat_threads_direct_pair")
+    # Group threads may now share a pair with each other or with a direct thread, which
+    # the table-wide constraint rejects. Their membership lives in chat_thread_members,
+    # so clear the pair on group threads; NULLs never collide under a unique constraint.
+    op.execute("UPDATE chat_threads SET user_one_id = NULL, user_two_id = NULL WHERE is_group")
+    op.create_unique_constraint("uq_chat_threads_user_pair", "chat_threads", ["user_one_id", "user_two_id"])
@@ -0,0 +1,26 @@
+"""documents keyset pagination index
+
+Revision ID: 031_documents_keyset_index
+Revises: 030_chat_threads_direct_pair_index
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+revision = "031_documents_keyset_index"
+down_revision = "030_chat_threads_direct_pair_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_documents_created_id",
+        "documents",
+        ["created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_documents_created_id", table_name="documents")
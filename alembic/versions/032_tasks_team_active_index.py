@@ -0,0 +1,28 @@
+"""tasks: partial index on assigned_team_id for live tasks
+
+Revision ID: 032_tasks_team_active_index
+Revises: 031_documents_keyset_index
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "032_tasks_team_active_index"
+down_revision = "031_documents_keyset_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_tasks_team_active",
+        "tasks",
+        ["assigned_team_id"],
+        unique=False,
+        postgresql_where=sa.text("deleted_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tasks_team_active", table_name="tasks")
@@ -0,0 +1,28 @@
+"""tasks: partial index on updated_at for completed tasks
+
+Revision ID: 033_tasks_completed_updated_at_index
+Revises: 032_tasks_team_active_index
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "033_tasks_completed_updated_at_index"
+down_revision = "032_tasks_team_active_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_tasks_completed_updated_at",
+        "tasks",
+        ["updated_at"],
+        unique=False,
+        postgresql_where=sa.text("status = 'Completed'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tasks_completed_updated_at", table_name="tasks")
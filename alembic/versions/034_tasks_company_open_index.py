@@ -0,0 +1,28 @@
+"""tasks: partial index on company_id for open tasks
+
+Revision ID: 034_tasks_company_open_index
+Revises: 033_tasks_completed_updated_at_index
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "034_tasks_company_open_index"
+down_revision = "033_tasks_completed_updated_at_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_tasks_company_open",
+        "tasks",
+        ["company_id"],
+        unique=False,
+        postgresql_where=sa.text("status <> 'Completed'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tasks_company_open", table_name="tasks")
@@ -0,0 +1,42 @@
+"""user_audit_logs: keep audit rows when their target user is deleted
+
+Revision ID: 035_user_audit_logs_target_set_null
+Revises: 034_tasks_company_open_index
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+revision = "035_user_audit_logs_target_set_null"
+down_revision = "034_tasks_company_open_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The RESTRICT foreign key made a delete_user audit row impossible: it could be
+    # written neither before the delete (blocking it) nor after (dangling reference).
+    op.drop_constraint("user_audit_logs_target_user_id_fkey", "user_audit_logs", type_="foreignkey")
+    op.alter_column("user_audit_logs", "target_user_id", nullable=True)
+    op.create_foreign_key(
+        "user_audit_logs_target_user_id_fkey",
+        "user_audit_logs",
+        "users",
+        ["target_user_id"],
+        ["id"],
+        ondelete="SET NULL",
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("user_audit_logs_target_user_id_fkey", "user_audit_logs", type_="foreignkey")
+    op.create_foreign_key(
+        "user_audit_logs_target_user_id_fkey",
+        "user_audit_logs",
+        "users",
+        ["target_user_id"],
+        ["id"],
+        ondelete="RESTRICT",
+    )
+    # Rows whose target user was deleted have no id to restore, so the column stays
+    # nullable rather than dropping those audit entries.
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import desc
+from sqlalchemy import desc, func
 from typing import Optional
 from uuid import UUID
 from datetime import datetime
@@ -18,6 +18,10 @@ from app.schemas.activity_log import ActivityLogResponse, ActivityLogListRespons
 from app.utils.visibility import can_user_view_task, can_user_view_project
 from app.utils.permissions import check_user_permission
 
+# Eager-load the performer in the same SELECT, but only the name columns the
+# response needs rather than the whole users row.
+_PERFORMED_BY_NAME = joinedload(ActivityLog.performed_by).load_only(User.first_name, User.last_name)
+
 router = APIRouter(prefix="/activity-logs", tags=["Activity Logs"])
 
 @router.get("/admin", response_model=ActivityLogListResponse)
@@ -44,9 +48,9 @@ def get_admin_activity_logs(
     if performed_by_user_id:
         query = query.filter(ActivityLog.performed_by_user_id == performed_by_user_id)
 
-    total = query.count()
+    total = query.with_entities(func.count(ActivityLog.id)).scalar()
     logs = (
-        query.options(joinedload(ActivityLog.performed_by))
+        query.options(_PERFORMED_BY_NAME)
         .order_by(desc(ActivityLog.created_at))
         .offset((page - 1) * page_size)
         .limit(page_size)
@@ -141,9 +145,9 @@ def get_entity_activity_logs(
         ActivityLog.entity_id == entity_id
     )
 
-    total = query.count()
+    total = query.with_entities(func.count(ActivityLog.id)).scalar()
     logs = (
-        query.options(joinedload(ActivityLog.performed_by))
+        query.options(_PERFORMED_BY_NAME)
         .order_by(desc(ActivityLog.created_at))
         .offset((page - 1) * page_size)
         .limit(page_size)
@@ -4,18 +4,17 @@ from sqlalchemy import func
 
 from app.core.database import get_db
 from app.core.deps import require_admin
-from app.models.user import User
 from app.models.department import Department
 from app.schemas.department import DepartmentCreate, DepartmentUpdate, DepartmentResponse, DepartmentListResponse
+from app.routers.departments import invalidate_department_list_cache
 
-router = APIRouter(prefix="/admin/departments", tags=["Admin - Departments"])
+router = APIRouter(prefix="/admin/departments", tags=["Admin - Departments"], dependencies=[Depends(require_admin)])
 
 
 @router.post("", response_model=DepartmentResponse, status_code=status.HTTP_201_CREATED)
 def create_department(
     department_data: DepartmentCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin)
+    db: Session = Depends(get_db)
 ):
     """
     Create a new department (admin only).
@@ -37,6 +36,7 @@ def create_department(
     
     db.add(department)
     db.commit()
+    invalidate_department_list_cache()
     db.refresh(department)
     
     return department
@@ -46,14 +46,13 @@ def create_department(
 def list_departments(
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin)
+    db: Session = Depends(get_db)
 ):
     """
     List all departments (admin only).
     """
     # Get total count
-    total = db.query(Department).count()
+    total = db.query(func.count(Department.id)).scalar()
     
     # Apply pagination
     departments = db.query(Department).order_by(Department.name).offset((page - 1) * page_size).limit(page_size).all()
@@ -69,8 +68,7 @@ def list_departments(
 @router.get("/{department_id}", response_model=DepartmentResponse)
 def get_department(
     department_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin)
+    db: Session = Depends(get_db)
 ):
     """
     Get department details by ID (admin only).
@@ -90,8 +88,7 @@ def get_department(
 def update_department(
     department_id: str,
     department_data: DepartmentUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin)
+    db: Session = Depends(get_db)
 ):
     """
     Update department name (admin only).
@@ -121,6 +118,7 @@ def update_department(
     department.name = department_data.name
     
     db.commit()
+    invalidate_department_list_cache()
     db.refresh(department)
     
     return department
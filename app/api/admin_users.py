@@ -1,4 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from typing import Optional, List
 import secrets
@@ -7,6 +10,7 @@ from uuid import UUID
 
 from app.core.database import get_db
 from app.core.deps import require_admin
+from app.core.config import settings
 from app.core.security import hash_password
 from app.models.user import User
 from app.models.permission import UserPagePermission
@@ -14,9 +18,14 @@ from app.models.page import Page
 from app.schemas.user import UserCreate, UserUpdate, UserResponse, UserListResponse, ALLOWED_USER_TYPES
 from app.schemas.permission import SetPermissionsRequest, PagePermissionResponse, ALLOWED_ACCESS_LEVELS
 from app.utils.audit import create_audit_log
+from app.utils.rate_limit import FixedWindowRateLimiter, client_ip, enforce_rate_limit
 
 router = APIRouter(prefix="/admin/users", tags=["Admin - User Management"])
 
+_ALLOWED_ACCESS_LEVEL_SET = frozenset(ALLOWED_ACCESS_LEVELS)
+
+_password_reset_limiter = FixedWindowRateLimiter(limit=settings.LOGIN_RATE_LIMIT_PER_MINUTE, window_seconds=60)
+
 
 def generate_temporary_password(length: int = 12) -> str:
     """Generate a random temporary password."""
@@ -51,48 +60,70 @@ def create_user(
             detail=f"Invalid user_type. Must be one of: {', '.join(ALLOWED_USER_TYPES)}"
         )
     
-    # Check if email already exists
-    if db.query(User).filter(User.email == user_data.email).first():
+    # Validate manager exists if provided
+    if user_data.manager_id:
+        manager = db.get(User, user_data.manager_id)
+        if not manager:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Manager not found"
+            )
+    
+    # Duplicate check before paying for a bcrypt hash: both flags in one round-trip.
+    email_taken, username_taken = db.execute(
+        sa.select(
+            sa.exists().where(User.email == user_data.email),
+            sa.exists().where(User.username == user_data.username),
+        )
+    ).one()
+    if email_taken:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
-    
-    # Check if username already exists
-    if db.query(User).filter(User.username == user_data.username).first():
+    if username_taken:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already taken"
         )
     
-    # Validate manager exists if provided
-    if user_data.manager_id:
-        manager = db.query(User).filter(User.id == user_data.manager_id).first()
-        if not manager:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Manager not found"
-            )
-    
     # Generate temporary password
     temp_password = generate_temporary_password()
     
-    # Create user
-    new_user = User(
-        email=user_data.email,
-        username=user_data.username,
-        first_name=user_data.first_name,
-        last_name=user_data.last_name,
-        hashed_password=hash_password(temp_password),
-        user_type=user_data.user_type,
-        manager_id=user_data.manager_id,
-        force_password_change=True,
-        is_active=True
+    # Create user. A concurrent create can still win the race after the check: a clash on
+    # email is absorbed by ON CONFLICT (email), one on username surfaces as IntegrityError.
+    stmt = (
+        pg_insert(User)
+        .values(
+            email=user_data.email,
+            username=user_data.username,
+            first_name=user_data.first_name,
+            last_name=user_data.last_name,
+            hashed_password=hash_password(temp_password),
+            user_type=user_data.user_type,
+            manager_id=user_data.manager_id,
+            force_password_change=True,
+            is_active=True
+        )
+        .on_conflict_do_nothing(index_elements=[User.email])
+        .returning(User)
     )
+    try:
+        new_user = db.scalars(stmt).first()
+    except IntegrityError:
+        db.rollback()
+        if db.query(sa.exists().where(User.username == user_data.username)).scalar():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Username already taken"
+            )
+        raise
     
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    if new_user is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
     
     # Create audit log
     create_audit_log(
@@ -109,6 +140,7 @@ def create_user(
             "manager_id": str(new_user.manager_id) if new_user.manager_id else None
         }
     )
+    db.commit()
     
     # Return explicit structure with plaintext password (ONCE)
     return {
@@ -151,7 +183,7 @@ def list_users(
         query = query.filter(User.is_active == is_active)
     
     # Get total count
-    total = query.count()
+    total = query.with_entities(sa.func.count(User.id)).scalar()
     
     # Apply pagination
     users = query.offset((page - 1) * page_size).limit(page_size).all()
@@ -173,7 +205,7 @@ def get_user(
     """
     Get user details by ID (admin only).
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.get(User, user_id)
     
     if not user:
         raise HTTPException(
@@ -194,7 +226,7 @@ def update_user(
     """
     Update user details (admin only).
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.get(User, user_id)
     
     if not user:
         raise HTTPException(
@@ -253,7 +285,7 @@ def update_user(
     
     if user_data.manager_id is not None:
         # Validate manager exists
-        manager = db.query(User).filter(User.id == user_data.manager_id).first()
+        manager = db.get(User, user_data.manager_id)
         if not manager:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -267,9 +299,6 @@ def update_user(
             )
         user.manager_id = user_data.manager_id
     
-    db.commit()
-    db.refresh(user)
-    
     # Capture after state
     after_state = {
         "email": user.email,
@@ -290,6 +319,8 @@ def update_user(
         before_state=before_state,
         after_state=after_state
     )
+    db.commit()
+    db.refresh(user)
     
     return user
 
@@ -298,6 +329,7 @@ def update_user(
 @router.post("/{user_id}/reset-password")
 def reset_password(
     user_id: UUID,
+    request: Request,
     db: Session = Depends(get_db),
     admin: User = Depends(require_admin)
 ):
@@ -305,7 +337,15 @@ def reset_password(
     Reset user password (admin only).
     Generates new random password and returns it plaintext ONCE.
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    # Each reset costs a bcrypt hash; cap them per admin and per client IP.
+    enforce_rate_limit(
+        _password_reset_limiter,
+        ("reset-admin", admin.id),
+        ("reset-ip", client_ip(request)),
+        detail="Too many password resets. Please try again later.",
+    )
+    
+    user = db.get(User, user_id)
     
     if not user:
         raise HTTPException(
@@ -322,7 +362,6 @@ def reset_password(
     # Update password
     user.hashed_password = hash_password(new_password)
     user.force_password_change = True
-    db.commit()
     
     # Create audit log
     create_audit_log(
@@ -334,6 +373,7 @@ def reset_password(
         # REDACTED: Never log the new password
         after_state={"password_reset": True}
     )
+    db.commit()
     
     return {"generated_password": new_password}
 
@@ -349,7 +389,7 @@ def set_user_permissions(
     Set page permissions for a user (admin only).
     Replaces all existing permissions.
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.get(User, user_id)
     
     if not user:
         raise HTTPException(
@@ -357,19 +397,19 @@ def set_user_permissions(
             detail="User not found"
         )
     
-    # Validate all access levels
-    for perm in permissions_data.permissions:
-        if perm.access not in ALLOWED_ACCESS_LEVELS:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid access level '{perm.access}'. Must be one of: {', '.join(ALLOWED_ACCESS_LEVELS)}"
-            )
+    # Validate all access levels (single set difference, reports every bad value)
+    invalid_access = {perm.access for perm in permissions_data.permissions} - _ALLOWED_ACCESS_LEVEL_SET
+    if invalid_access:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid access level(s) {', '.join(repr(a) for a in sorted(invalid_access))}. Must be one of: {', '.join(ALLOWED_ACCESS_LEVELS)}"
+        )
     
     # Validate all pages exist
     page_ids = [perm.page_id for perm in permissions_data.permissions]
-    pages = db.query(Page).filter(Page.id.in_(page_ids)).all()
+    found_page_ids = {row[0] for row in db.query(Page.id).filter(Page.id.in_(page_ids)).all()}
     
-    if len(pages) != len(page_ids):
+    if len(page_ids) != len(set(page_ids)) or set(page_ids) - found_page_ids:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="One or more page IDs are invalid"
@@ -400,12 +440,6 @@ def set_user_permissions(
         db.add(perm)
         new_permissions.append(perm)
     
-    db.commit()
-    
-    # Refresh all permissions
-    for perm in new_permissions:
-        db.refresh(perm)
-    
     # Capture after state
     after_state = {
         "permissions": [
@@ -423,6 +457,11 @@ def set_user_permissions(
         before_state=before_state,
         after_state=after_state
     )
+    db.commit()
+    
+    # Refresh all permissions
+    for perm in new_permissions:
+        db.refresh(perm)
     
     return new_permissions
 
@@ -437,7 +476,7 @@ def deactivate_user(  # Legacy POST endpoint kept for backward compatibility
     Deactivate a user (admin only).
     Prevents login but keeps historical references intact.
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.get(User, user_id)
     
     if not user:
         raise HTTPException(
@@ -457,7 +496,6 @@ def deactivate_user(  # Legacy POST endpoint kept for backward compatibility
     
     # Deactivate user
     user.is_active = False
-    db.commit()
     
     # Capture after state
     after_state = {"is_active": user.is_active}
@@ -471,6 +509,7 @@ def deactivate_user(  # Legacy POST endpoint kept for backward compatibility
         before_state=before_state,
         after_state=after_state
     )
+    db.commit()
     
     return {"message": "User deactivated successfully"}
 
@@ -485,7 +524,7 @@ def deactivate_user_patch(
     Deactivate a user (admin only).
     PATCH variant per current API spec.
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.get(User, user_id)
 
     if not user:
         raise HTTPException(
@@ -501,7 +540,6 @@ def deactivate_user_patch(
 
     before_state = {"is_active": user.is_active}
     user.is_active = False
-    db.commit()
     after_state = {"is_active": user.is_active}
 
     create_audit_log(
@@ -512,6 +550,7 @@ def deactivate_user_patch(
         before_state=before_state,
         after_state=after_state
     )
+    db.commit()
 
     return {"message": "User deactivated successfully"}
 
@@ -525,7 +564,7 @@ def activate_user(
     """
     Activate a user (admin only).
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.get(User, user_id)
 
     if not user:
         raise HTTPException(
@@ -535,7 +574,6 @@ def activate_user(
 
     before_state = {"is_active": user.is_active}
     user.is_active = True
-    db.commit()
     after_state = {"is_active": user.is_active}
 
     create_audit_log(
@@ -546,6 +584,7 @@ def activate_user(
         before_state=before_state,
         after_state=after_state
     )
+    db.commit()
 
     return {"message": "User activated successfully"}
 
@@ -559,7 +598,7 @@ def delete_user(
     """
     Permanently delete a user (admin only).
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.get(User, user_id)
 
     if not user:
         raise HTTPException(
@@ -573,7 +612,17 @@ def delete_user(
             detail="Cannot delete your own account"
         )
 
+    # The audit row is written first and committed with the delete; the database then
+    # nulls its target_user_id, so the user's identity is kept in before_state.
     try:
+        create_audit_log(
+            db=db,
+            admin_user_id=str(admin.id),
+            target_user_id=str(user.id),
+            action="delete_user",
+            before_state={"id": str(user.id), "email": user.email, "username": user.username},
+            after_state=None
+        )
         db.delete(user)
         db.commit()
     except Exception:
@@ -583,13 +632,4 @@ def delete_user(
             detail="Unable to delete user due to related records"
         )
 
-    create_audit_log(
-        db=db,
-        admin_user_id=str(admin.id),
-        target_user_id=str(user_id),
-        action="delete_user",
-        before_state={"id": str(user_id)},
-        after_state=None
-    )
-
     return None
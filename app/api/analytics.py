@@ -1,15 +1,18 @@
 from __future__ import annotations
 
+import hashlib
 from datetime import date, datetime, timedelta, timezone
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import Date, and_, cast, func, or_
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import Date, DateTime, and_, cast, func, literal_column, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, aliased
 
-from app.core.database import get_db
-from app.core.deps import get_current_user
+from app.core.database import get_async_db
+from app.core.deps import get_current_user_async
 from app.models.company import Company
 from app.models.task import Task
 from app.models.team import Team
@@ -30,13 +33,16 @@ from app.utils.cache import TTLCache
 from app.utils.permissions import check_user_permission, get_user_hierarchy
 
 
-router = APIRouter(prefix="/analytics", tags=["Analytics"])
-
-_cache = TTLCache(ttl_seconds=60)
-
-
-def _require_analytics_permission(db: Session, current_user: User) -> None:
-    permission = check_user_permission(db=db, user=current_user, page_key="analytics")
+async def _require_analytics_permission(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+) -> None:
+    # Router dependency on the request's AsyncSession (shared with the handler through
+    # FastAPI's per-request dependency cache): one connection serves authentication,
+    # the page-permission check and the report queries.
+    permission = await db.run_sync(
+        lambda session: check_user_permission(db=session, user=current_user, page_key="analytics")
+    )
     if permission == "none":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -44,6 +50,17 @@ def _require_analytics_permission(db: Session, current_user: User) -> None:
         )
 
 
+router = APIRouter(prefix="/analytics", tags=["Analytics"], dependencies=[Depends(_require_analytics_permission)])
+
+# Reports are cached as serialized JSON so repeated dashboard polls skip the queries, and
+# clients revalidating with If-None-Match get a 304 without the body.
+REPORT_CACHE_TTL_SECONDS = 60
+_cache = TTLCache(ttl_seconds=REPORT_CACHE_TTL_SECONDS)
+
+# Longest date_from..date_to span the completed series will zero-fill day by day.
+COMPLETED_SERIES_MAX_DAYS = 366
+
+
 def _cache_key(endpoint: str, current_user: User, **params: object) -> tuple:
     normalized = []
     for key in sorted(params.keys()):
@@ -56,6 +73,17 @@ def _cache_key(endpoint: str, current_user: User, **params: object) -> tuple:
     return (endpoint, str(current_user.id), tuple(normalized))
 
 
+def _report_response(request: Request, body: bytes) -> Response:
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={REPORT_CACHE_TTL_SECONDS}"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag in candidates or "*" in candidates:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 def _get_scope_user_ids(db: Session, current_user: User) -> Optional[list[UUID]]:
     if current_user.user_type in ("Admin", "Pillar"):
         return None
@@ -66,67 +94,68 @@ def _get_scope_user_ids(db: Session, current_user: User) -> Optional[list[UUID]]
     return [current_user.id]
 
 
-def _build_task_scope_filter(db: Session, current_user: User):
-    scope_user_ids = _get_scope_user_ids(db, current_user)
+# Report endpoints run on the async engine; the manager hierarchy walk is shared sync ORM
+# code, so it is bridged through AsyncSession.run_sync.
+async def _get_scope_user_ids_async(db: AsyncSession, current_user: User) -> Optional[list[UUID]]:
+    return await db.run_sync(lambda session: _get_scope_user_ids(session, current_user))
+
+
+def _task_scope_filter(scope_user_ids: Optional[list[UUID]]):
     if scope_user_ids is None:
         return True
     return or_(Task.owner_user_id.in_(scope_user_ids), Task.assigned_user_id.in_(scope_user_ids))
 
 
+def _display_name(user):
+    # "First Last" built in the query, so rows arrive with the display string ready.
+    return func.trim(user.first_name + literal_column("' '") + user.last_name)
+
+
 def _active_tasks_filter():
     return Task.status != "Completed"
 
 
 @router.get("/summary", response_model=AnalyticsSummaryResponse)
-def get_analytics_summary(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+async def get_analytics_summary(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
-    _require_analytics_permission(db=db, current_user=current_user)
     key = _cache_key("summary", current_user)
     cached = _cache.get(key)
     if cached is not None:
-        return cached
+        return _report_response(request, cached)
 
     today = datetime.now(timezone.utc).date()
     month_start = date(today.year, today.month, 1)
     completed_since = datetime.now(timezone.utc) - timedelta(days=30)
 
-    scope_filter = _build_task_scope_filter(db=db, current_user=current_user)
-
-    active_tasks_count = db.query(func.count(Task.id)).filter(scope_filter, _active_tasks_filter()).scalar() or 0
-    overdue_tasks_count = (
-        db.query(func.count(Task.id))
-        .filter(scope_filter, _active_tasks_filter(), Task.deadline < today)
-        .scalar()
-        or 0
-    )
-    # completed_at is not available in current schema; updated_at on completed tasks is used as completion proxy.
-    completed_last_30_days = (
-        db.query(func.count(Task.id))
-        .filter(scope_filter, Task.status == "Completed", Task.updated_at >= completed_since)
-        .scalar()
-        or 0
-    )
-    tasks_created_this_month = (
-        db.query(func.count(Task.id))
-        .filter(scope_filter, Task.created_at >= month_start)
-        .scalar()
-        or 0
+    # The hierarchy lookup runs once; the scope filter is built from its result.
+    scope_user_ids = await _get_scope_user_ids_async(db, current_user)
+    scope_filter = _task_scope_filter(scope_user_ids)
+
+    # Every task counter in a single pass over the scoped tasks (FILTERed aggregates)
+    # instead of one scan per counter.
+    task_counts = [
+        func.count(Task.id).filter(_active_tasks_filter()),
+        func.count(Task.id).filter(_active_tasks_filter(), Task.deadline < today),
+        # completed_at is not available in current schema; updated_at on completed tasks is used as completion proxy.
+        func.count(Task.id).filter(Task.status == "Completed", Task.updated_at >= completed_since),
+        func.count(Task.id).filter(Task.created_at >= month_start),
+    ]
+    if scope_user_ids is not None:
+        task_counts.append(func.count(func.distinct(Task.company_id)))
+    counts = (await db.execute(select(*task_counts).where(scope_filter))).one()
+    active_tasks_count, overdue_tasks_count, completed_last_30_days, tasks_created_this_month = (
+        count or 0 for count in counts[:4]
     )
 
-    scope_user_ids = _get_scope_user_ids(db, current_user)
     if scope_user_ids is None:
-        total_users = db.query(func.count(User.id)).scalar() or 0
-        total_companies = db.query(func.count(Company.id)).scalar() or 0
+        total_users = await db.scalar(select(func.count(User.id))) or 0
+        total_companies = await db.scalar(select(func.count(Company.id))) or 0
     else:
-        total_users = db.query(func.count(User.id)).filter(User.id.in_(scope_user_ids)).scalar() or 0
-        total_companies = (
-            db.query(func.count(func.distinct(Task.company_id)))
-            .filter(scope_filter)
-            .scalar()
-            or 0
-        )
+        total_users = await db.scalar(select(func.count(User.id)).where(User.id.in_(scope_user_ids))) or 0
+        total_companies = counts[4] or 0
 
     result = AnalyticsSummaryResponse(
         active_tasks=active_tasks_count,
@@ -136,12 +165,14 @@ def get_analytics_summary(
         total_companies=total_companies,
         total_users=total_users,
     )
-    _cache.set(key, result)
-    return result
+    body = result.model_dump_json().encode()
+    _cache.set(key, body)
+    return _report_response(request, body)
 
 
 @router.get("/tasks", response_model=AnalyticsTaskListResponse)
-def get_analytics_tasks(
+async def get_analytics_tasks(
+    request: Request,
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=100),
     company_id: Optional[UUID] = Query(None),
@@ -150,10 +181,9 @@ def get_analytics_tasks(
     date_to: Optional[date] = Query(None),
     status_filter: Optional[str] = Query(None, alias="status"),
     urgency_label: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
-    _require_analytics_permission(db=db, current_user=current_user)
     if status_filter is not None and status_filter not in ALLOWED_STATUSES:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid status. Must be one of: {ALLOWED_STATUSES}")
     if urgency_label is not None and urgency_label not in ALLOWED_URGENCY_LABELS:
@@ -176,19 +206,18 @@ def get_analytics_tasks(
     )
     cached = _cache.get(key)
     if cached is not None:
-        return cached
+        return _report_response(request, cached)
 
-    scope_filter = _build_task_scope_filter(db=db, current_user=current_user)
+    scope_filter = _task_scope_filter(await _get_scope_user_ids_async(db, current_user))
     owner_user = aliased(User)
     assignee_user = aliased(User)
 
     query = (
-        db.query(
+        select(
             Task.id.label("task_id"),
             Task.title,
             Company.name.label("company_name"),
-            owner_user.first_name.label("owner_first_name"),
-            owner_user.last_name.label("owner_last_name"),
+            _display_name(owner_user).label("owner_name"),
             assignee_user.first_name.label("assignee_first_name"),
             assignee_user.last_name.label("assignee_last_name"),
             Team.name.label("team_name"),
@@ -200,28 +229,29 @@ def get_analytics_tasks(
         .join(owner_user, owner_user.id == Task.owner_user_id)
         .outerjoin(assignee_user, assignee_user.id == Task.assigned_user_id)
         .outerjoin(Team, Team.id == Task.assigned_team_id)
-        .filter(scope_filter)
+        .where(scope_filter)
     )
 
     if company_id is not None:
-        query = query.filter(Task.company_id == company_id)
+        query = query.where(Task.company_id == company_id)
     if user_id is not None:
-        query = query.filter(or_(Task.owner_user_id == user_id, Task.assigned_user_id == user_id))
+        query = query.where(or_(Task.owner_user_id == user_id, Task.assigned_user_id == user_id))
     if date_from is not None:
-        query = query.filter(Task.created_at >= date_from)
+        query = query.where(Task.created_at >= date_from)
     if date_to is not None:
-        query = query.filter(Task.created_at < (date_to + timedelta(days=1)))
+        query = query.where(Task.created_at < (date_to + timedelta(days=1)))
     if status_filter is not None:
-        query = query.filter(Task.status == status_filter)
+        query = query.where(Task.status == status_filter)
     if urgency_label is not None:
-        query = query.filter(Task.urgency_label == urgency_label)
+        query = query.where(Task.urgency_label == urgency_label)
 
-    total = query.count()
-    rows = query.order_by(Task.deadline.asc()).offset((page - 1) * page_size).limit(page_size).all()
+    total = await db.scalar(select(func.count()).select_from(query.subquery()))
+    rows = (
+        await db.execute(query.order_by(Task.deadline.asc()).offset((page - 1) * page_size).limit(page_size))
+    ).all()
 
     tasks = []
     for row in rows:
-        owner_name = f"{row.owner_first_name} {row.owner_last_name}".strip()
         assignee_name = None
         if row.assignee_first_name or row.assignee_last_name:
             assignee_name = f"{row.assignee_first_name or ''} {row.assignee_last_name or ''}".strip()
@@ -234,7 +264,7 @@ def get_analytics_tasks(
                 title=row.title,
                 company_name=row.company_name,
                 assignee_name=assignee_name,
-                owner_name=owner_name,
+                owner_name=row.owner_name,
                 status=row.status,
                 urgency_label=row.urgency_label,
                 deadline=row.deadline,
@@ -242,97 +272,149 @@ def get_analytics_tasks(
         )
 
     result = AnalyticsTaskListResponse(tasks=tasks, total=total, page=page, page_size=page_size)
-    _cache.set(key, result)
-    return result
+    body = result.model_dump_json().encode()
+    _cache.set(key, body)
+    return _report_response(request, body)
 
 
 @router.get("/tasks-per-company", response_model=TasksPerCompanyResponse)
-def get_tasks_per_company(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+async def get_tasks_per_company(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
-    _require_analytics_permission(db=db, current_user=current_user)
     key = _cache_key("tasks-per-company", current_user)
     cached = _cache.get(key)
     if cached is not None:
-        return cached
+        return _report_response(request, cached)
 
-    scope_filter = _build_task_scope_filter(db=db, current_user=current_user)
+    scope_filter = _task_scope_filter(await _get_scope_user_ids_async(db, current_user))
 
-    rows = (
-        db.query(
-            Company.id.label("company_id"),
-            Company.name.label("company_name"),
+    # Aggregate on tasks.company_id first and join companies to the per-company
+    # counts, so the join touches one row per company rather than one per task.
+    counts = (
+        select(
+            Task.company_id.label("company_id"),
             func.count(Task.id).label("task_count"),
         )
-        .join(Task, Task.company_id == Company.id)
-        .filter(scope_filter, _active_tasks_filter())
-        .group_by(Company.id, Company.name)
-        .order_by(func.count(Task.id).desc(), Company.name.asc())
-        .all()
+        .where(scope_filter, _active_tasks_filter())
+        .group_by(Task.company_id)
+        .subquery()
     )
+    rows = (
+        await db.execute(
+            select(
+                Company.id.label("company_id"),
+                Company.name.label("company_name"),
+                counts.c.task_count,
+            )
+            .join(counts, counts.c.company_id == Company.id)
+            .order_by(counts.c.task_count.desc(), Company.name.asc())
+        )
+    ).all()
 
     result = TasksPerCompanyResponse(
         items=[TasksPerCompanyRow(company_id=row.company_id, company_name=row.company_name, task_count=row.task_count) for row in rows]
     )
-    _cache.set(key, result)
-    return result
+    body = result.model_dump_json().encode()
+    _cache.set(key, body)
+    return _report_response(request, body)
 
 
 @router.get("/tasks-per-user", response_model=TasksPerUserResponse)
-def get_tasks_per_user(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+async def get_tasks_per_user(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size; omit to return every user"),
+    offset: Optional[int] = Query(None, ge=0),
+    after_count: Optional[int] = Query(None, ge=0, description="Keyset cursor: task_count of the previous page's last row"),
+    after_id: Optional[UUID] = Query(None, description="Keyset cursor: user_id of the previous page's last row"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
-    _require_analytics_permission(db=db, current_user=current_user)
-    key = _cache_key("tasks-per-user", current_user)
+    if (after_count is None) != (after_id is None):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="after_count and after_id must be sent together",
+        )
+    if offset is not None and after_id is not None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Use either offset or after_count/after_id, not both",
+        )
+
+    key = _cache_key(
+        "tasks-per-user", current_user, limit=limit, offset=offset, after_count=after_count, after_id=after_id
+    )
     cached = _cache.get(key)
     if cached is not None:
-        return cached
+        return _report_response(request, cached)
 
-    scope_filter = _build_task_scope_filter(db=db, current_user=current_user)
+    scope_filter = _task_scope_filter(await _get_scope_user_ids_async(db, current_user))
 
-    rows = (
-        db.query(
-            User.id.label("user_id"),
-            User.first_name.label("first_name"),
-            User.last_name.label("last_name"),
+    counts = (
+        select(
+            Task.assigned_user_id.label("user_id"),
             func.count(Task.id).label("task_count"),
         )
-        .join(Task, Task.assigned_user_id == User.id)
-        .filter(scope_filter, _active_tasks_filter(), Task.assigned_user_id.isnot(None))
-        .group_by(User.id, User.first_name, User.last_name)
-        .order_by(func.count(Task.id).desc(), User.first_name.asc(), User.last_name.asc())
-        .all()
+        .where(scope_filter, _active_tasks_filter(), Task.assigned_user_id.isnot(None))
+        .group_by(Task.assigned_user_id)
+        .subquery()
+    )
+    # Busiest users first; user id breaks ties so (task_count, user_id) is a stable
+    # keyset for paging with after_count/after_id.
+    query = (
+        select(
+            User.id.label("user_id"),
+            _display_name(User).label("user_name"),
+            counts.c.task_count,
+        )
+        .join(counts, counts.c.user_id == User.id)
+        .order_by(counts.c.task_count.desc(), User.id.asc())
     )
+    if after_id is not None:
+        query = query.where(
+            or_(
+                counts.c.task_count < after_count,
+                and_(counts.c.task_count == after_count, User.id > after_id),
+            )
+        )
+    if offset is not None:
+        query = query.offset(offset)
+    if limit is not None:
+        query = query.limit(limit)
+    rows = (await db.execute(query)).all()
 
     result = TasksPerUserResponse(
         items=[
             TasksPerUserRow(
                 user_id=row.user_id,
-                user_name=f"{row.first_name} {row.last_name}".strip(),
+                user_name=row.user_name,
                 task_count=row.task_count,
             )
             for row in rows
         ]
     )
-    _cache.set(key, result)
-    return result
+    body = result.model_dump_json().encode()
+    _cache.set(key, body)
+    return _report_response(request, body)
 
 
-@router.get("/users")
-def get_analytics_users(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+@router.get("/users", response_class=ORJSONResponse)
+async def get_analytics_users(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
-    _require_analytics_permission(db=db, current_user=current_user)
-    scope_user_ids = _get_scope_user_ids(db, current_user)
+    scope_user_ids = await _get_scope_user_ids_async(db, current_user)
 
-    query = db.query(User).filter(User.is_active.is_(True))
+    query = select(User.id, User.first_name, User.last_name, User.username, User.email).where(
+        User.is_active.is_(True)
+    )
     if scope_user_ids is not None:
-        query = query.filter(User.id.in_(scope_user_ids))
+        query = query.where(User.id.in_(scope_user_ids))
 
-    users = query.order_by(User.first_name.asc(), User.last_name.asc(), User.username.asc()).all()
+    users = (
+        await db.execute(query.order_by(User.first_name.asc(), User.last_name.asc(), User.username.asc()))
+    ).all()
     return {
         "users": [
             {
@@ -348,41 +430,86 @@ def get_analytics_users(
 
 
 @router.get("/completed", response_model=CompletedSeriesResponse)
-def get_completed_series(
+async def get_completed_series(
+    request: Request,
     date_from: Optional[date] = Query(None),
     date_to: Optional[date] = Query(None),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
-    _require_analytics_permission(db=db, current_user=current_user)
+    if date_from is not None and date_to is not None:
+        if date_from > date_to:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="date_from must not be after date_to",
+            )
+        if (date_to - date_from).days + 1 > COMPLETED_SERIES_MAX_DAYS:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Date range must not exceed {COMPLETED_SERIES_MAX_DAYS} days",
+            )
+
     key = _cache_key("completed", current_user, date_from=date_from, date_to=date_to)
     cached = _cache.get(key)
     if cached is not None:
-        return cached
+        return _report_response(request, cached)
 
-    scope_filter = _build_task_scope_filter(db=db, current_user=current_user)
+    scope_filter = _task_scope_filter(await _get_scope_user_ids_async(db, current_user))
     completed_date_expr = cast(Task.updated_at, Date)
 
+    # Range predicates on the raw timestamp so ix_tasks_completed_updated_at can serve them;
+    # the date cast is only applied for grouping.
     conditions = [scope_filter, Task.status == "Completed"]
     if date_from is not None:
-        conditions.append(completed_date_expr >= date_from)
+        conditions.append(Task.updated_at >= date_from)
     if date_to is not None:
-        conditions.append(completed_date_expr <= date_to)
+        conditions.append(Task.updated_at < (date_to + timedelta(days=1)))
 
-    rows = (
-        db.query(
+    completed = (
+        select(
             completed_date_expr.label("completed_date"),
             func.count(Task.id).label("completed_count"),
         )
-        .filter(and_(*conditions))
+        .where(and_(*conditions))
         .group_by(completed_date_expr)
-        .order_by(completed_date_expr.asc())
-        .all()
+        .subquery()
     )
 
+    if date_from is None or date_to is None:
+        # Open-ended ranges return only the days that have completions; zero-filling
+        # them would generate a row for every day between the data's extremes.
+        rows = (
+            await db.execute(
+                select(completed.c.completed_date, completed.c.completed_count)
+                .order_by(completed.c.completed_date.asc())
+            )
+        ).all()
+    else:
+        # Days without completions within the bounded range are filled in by
+        # generate_series, so the series has no gaps.
+        days = func.generate_series(
+            cast(date_from, DateTime),
+            cast(date_to, DateTime),
+            literal_column("interval '1 day'"),
+        ).table_valued("day").render_derived()
+        day_expr = cast(days.c.day, Date)
+
+        rows = (
+            await db.execute(
+                select(
+                    day_expr.label("completed_date"),
+                    func.coalesce(completed.c.completed_count, 0).label("completed_count"),
+                )
+                .select_from(days)
+                .outerjoin(completed, completed.c.completed_date == day_expr)
+                .order_by(days.c.day.asc())
+            )
+        ).all()
+
     result = CompletedSeriesResponse(
         items=[CompletedSeriesRow(date=row.completed_date, completed_count=row.completed_count) for row in rows]
     )
-    _cache.set(key, result)
-    return result
+    body = result.model_dump_json().encode()
+    _cache.set(key, body)
+    return _report_response(request, body)
 
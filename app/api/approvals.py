@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 
+import sqlalchemy as sa
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from sqlalchemy import or_
@@ -42,8 +43,8 @@ def create_approval(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    receiver = db.query(User).filter(User.id == approval_in.receiver_user_id).first()
-    if not receiver:
+    receiver_exists = db.query(sa.exists().where(User.id == approval_in.receiver_user_id)).scalar()
+    if not receiver_exists:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Receiver user not found")
 
     approval = ApprovalRequest(
@@ -56,8 +57,7 @@ def create_approval(
         resolved_at=None,
     )
     db.add(approval)
-    db.commit()
-    db.refresh(approval)
+    db.flush()
 
     # Activity Log (PRD)
     log_activity(
@@ -74,7 +74,6 @@ def create_approval(
             "status": approval.status,
         },
     )
-    db.commit()
 
     # Notification (PRD)
     create_notification(
@@ -88,6 +87,7 @@ def create_approval(
         link=f"/approvals/{approval.id}",
         notification_type="ASSIGNMENT",
     )
+    # Approval, activity log and notification land in a single transaction.
     db.commit()
 
     return _to_approval_response(approval)
@@ -158,8 +158,7 @@ def _resolve_approval(
     approval.resolved_at = datetime.now(timezone.utc)
 
     db.add(approval)
-    db.commit()
-    db.refresh(approval)
+    db.flush()
 
     log_activity(
         db=db,
@@ -170,7 +169,6 @@ def _resolve_approval(
         old_value={"status": old_status},
         new_value={"status": new_status},
     )
-    db.commit()
 
     # Notification (PRD): Approval resolved -> receiver notifies requester.
     create_notification(
@@ -1,34 +1,56 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from datetime import datetime, timezone, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timezone
 import secrets
 
-from app.core.database import get_db
-from app.core.security import verify_password, create_access_token, create_refresh_token, decode_token, hash_password
-from app.core.deps import get_current_user
+from app.core.database import get_async_db
+from app.core.security import REFRESH_TOKEN_LIFETIME, verify_password_async, create_access_token, create_refresh_token, decode_token, hash_password, hash_refresh_token
+from app.core.deps import get_current_user_async
 from app.core.config import settings
 from app.models.user import User
 from app.models.auth import AuthRefreshToken
 from app.schemas.auth import LoginRequest, TokenResponse, RefreshRequest
 from app.schemas.user import UserResponse
+from app.utils.rate_limit import FixedWindowRateLimiter, client_ip, enforce_rate_limit
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
+# Every login attempt that reaches bcrypt costs a full hash, so attempts are capped
+# per client IP and per submitted identifier before any password is checked. Refresh
+# attempts are capped per client IP so stolen-token guessing is throttled as well.
+_auth_limiter = FixedWindowRateLimiter(limit=settings.LOGIN_RATE_LIMIT_PER_MINUTE, window_seconds=60)
+
+
+def _enforce_login_rate_limit(request: Request, username_or_email: str) -> None:
+    enforce_rate_limit(
+        _auth_limiter,
+        ("login-ip", client_ip(request)),
+        ("login-identifier", username_or_email.strip().lower()),
+        detail="Too many login attempts. Please try again later.",
+    )
+
 
 @router.post("/login", response_model=TokenResponse)
-def login(
+async def login(
     login_data: LoginRequest,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Login with username/email and password.
     Returns JWT access token and refresh token.
     """
+    _enforce_login_rate_limit(request, login_data.username_or_email)
+    
     # Find user by username or email
-    user = db.query(User).filter(
-        (User.username == login_data.username_or_email) | 
-        (User.email == login_data.username_or_email)
-    ).first()
+    result = await db.execute(
+        select(User).where(
+            (User.username == login_data.username_or_email) | 
+            (User.email == login_data.username_or_email)
+        )
+    )
+    user = result.scalars().first()
     
     if not user:
         raise HTTPException(
@@ -36,8 +58,8 @@ def login(
             detail="Incorrect username/email or password"
         )
     
-    # Verify password
-    if not verify_password(login_data.password, user.hashed_password):
+    # Verify password (bcrypt runs on its dedicated executor)
+    if not await verify_password_async(login_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username/email or password"
@@ -57,11 +79,11 @@ def login(
     # Store refresh token in database
     refresh_token = AuthRefreshToken(
         user_id=user.id,
-        token=refresh_token_value,
-        expires_at=datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+        token_hash=hash_refresh_token(refresh_token_value),
+        expires_at=datetime.now(timezone.utc) + REFRESH_TOKEN_LIFETIME
     )
     db.add(refresh_token)
-    db.commit()
+    await db.commit()
     
     return TokenResponse(
         access_token=access_token,
@@ -70,13 +92,20 @@ def login(
 
 
 @router.post("/refresh", response_model=TokenResponse)
-def refresh_token(
+async def refresh_token(
     refresh_data: RefreshRequest,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Refresh access token using refresh token.
     """
+    enforce_rate_limit(
+        _auth_limiter,
+        ("refresh-ip", client_ip(request)),
+        detail="Too many token refresh attempts. Please try again later.",
+    )
+    
     # Decode refresh token
     payload = decode_token(refresh_data.refresh_token)
     if not payload or payload.get("type") != "refresh":
@@ -86,9 +115,10 @@ def refresh_token(
         )
     
     # Check if refresh token exists in database
-    stored_token = db.query(AuthRefreshToken).filter(
-        AuthRefreshToken.token == refresh_data.refresh_token
-    ).first()
+    result = await db.execute(
+        select(AuthRefreshToken).where(AuthRefreshToken.token_hash == hash_refresh_token(refresh_data.refresh_token))
+    )
+    stored_token = result.scalars().first()
     
     if not stored_token:
         raise HTTPException(
@@ -98,8 +128,8 @@ def refresh_token(
     
     # Check if token is expired
     if stored_token.expires_at < datetime.now(timezone.utc):
-        db.delete(stored_token)
-        db.commit()
+        await db.delete(stored_token)
+        await db.commit()
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Refresh token expired"
@@ -107,7 +137,8 @@ def refresh_token(
     
     # Get user
     user_id = payload.get("sub")
-    user = db.query(User).filter(User.id == user_id).first()
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalars().first()
     
     if not user or not user.is_active:
         raise HTTPException(
@@ -126,7 +157,7 @@ def refresh_token(
 
 
 @router.get("/me", response_model=UserResponse)
-def get_me(current_user: User = Depends(get_current_user)):
+async def get_me(current_user: User = Depends(get_current_user_async)):
     """
     Get current user.
     """
@@ -134,25 +165,25 @@ def get_me(current_user: User = Depends(get_current_user)):
 
 
 @router.post("/logout")
-def logout(
+async def logout(
     refresh_data: RefreshRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
 ):
     """
     Logout by invalidating refresh token.
     """
     # Delete refresh token from database
-    stored_token = db.query(AuthRefreshToken).filter(
-        AuthRefreshToken.token == refresh_data.refresh_token,
-        AuthRefreshToken.user_id == current_user.id
-    ).first()
+    result = await db.execute(
+        select(AuthRefreshToken).where(
+            AuthRefreshToken.token_hash == hash_refresh_token(refresh_data.refresh_token),
+            AuthRefreshToken.user_id == current_user.id
+        )
+    )
+    stored_token = result.scalars().first()
     
     if stored_token:
-        db.delete(stored_token)
-        db.commit()
+        await db.delete(stored_token)
+        await db.commit()
     
     return {"message": "Logged out successfully"}
-
-
-
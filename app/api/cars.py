@@ -5,12 +5,14 @@ from typing import Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import func
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import exists, func, or_, select
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
-from app.core.deps import get_current_user, require_admin
+from app.core.database import get_async_db, get_db
+from app.core.deps import get_current_user, get_current_user_async, require_admin
 from app.models.car import Car
 from app.models.car_expense import CarExpense
 from app.models.car_income import CarIncome
@@ -31,10 +33,20 @@ from app.schemas.car import (
     CarUpdate,
 )
 from app.utils.activity_logger import log_activity
+from app.utils.cache import TTLCache
 from app.utils.permissions import check_user_permission
 
 router = APIRouter(prefix="/cars", tags=["Cars"])
 
+# Financials are re-requested as the dashboard is browsed. Income/expense writes and car
+# deletion in this process invalidate the car's entry; other workers catch up within the TTL.
+CAR_FINANCIALS_CACHE_TTL_SECONDS = 30
+_car_financials_cache = TTLCache(ttl_seconds=CAR_FINANCIALS_CACHE_TTL_SECONDS, max_entries=1000)
+
+
+def invalidate_car_financials_cache(car_id: UUID) -> None:
+    _car_financials_cache.delete(car_id)
+
 
 def _car_snapshot(car: Car) -> dict:
     return {
@@ -70,6 +82,25 @@ def _get_car_or_404(db: Session, car_id: UUID) -> Car:
     return car
 
 
+def _ensure_car_exists(db: Session, car_id: UUID) -> None:
+    # Existence only: SELECT EXISTS short-circuits and hydrates no Car.
+    if not db.query(exists().where(Car.id == car_id)).scalar():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Car not found")
+
+
+# Read endpoints run on the async engine; the shared permission check is sync ORM code,
+# so it is bridged through AsyncSession.run_sync rather than duplicated.
+async def _require_cars_permission_async(db: AsyncSession, current_user: User) -> str:
+    return await db.run_sync(lambda session: _require_cars_permission(db=session, current_user=current_user))
+
+
+async def _get_car_or_404_async(db: AsyncSession, car_id: UUID) -> Car:
+    car = await db.get(Car, car_id)
+    if not car:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Car not found")
+    return car
+
+
 @router.post("", response_model=CarResponse, status_code=status.HTTP_201_CREATED)
 def create_car(
     payload: CarCreate,
@@ -113,33 +144,34 @@ def create_car(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid car data")
 
 
-@router.get("", response_model=CarListResponse)
-def list_cars(
+@router.get("", response_model=CarListResponse, response_class=ORJSONResponse)
+async def list_cars(
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=100),
     status_filter: Optional[str] = Query(None, alias="status", description="Filter by car status"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
-    _require_cars_permission(db=db, current_user=current_user)
+    await _require_cars_permission_async(db=db, current_user=current_user)
 
-    query = db.query(Car)
+    query = select(Car)
     if status_filter is not None:
-        query = query.filter(Car.status == status_filter)
-    total = query.count()
-    cars = query.order_by(Car.created_at.desc()).offset((page - 1) * page_size).limit(page_size).all()
+        query = query.where(Car.status == status_filter)
+    total = await db.scalar(query.with_only_columns(func.count(Car.id)))
+    result = await db.scalars(query.order_by(Car.created_at.desc()).offset((page - 1) * page_size).limit(page_size))
+    cars = result.all()
     return CarListResponse(cars=cars, total=total, page=page, page_size=page_size)
 
 
 @router.get("/{car_id}", response_model=CarDetailResponse)
-def get_car(
+async def get_car(
     car_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
-    _require_cars_permission(db=db, current_user=current_user)
-    car = _get_car_or_404(db, car_id)
-    maintenance = db.query(CarMaintenance).filter(CarMaintenance.car_id == car_id).first()
+    await _require_cars_permission_async(db=db, current_user=current_user)
+    car = await _get_car_or_404_async(db, car_id)
+    maintenance = (await db.scalars(select(CarMaintenance).where(CarMaintenance.car_id == car_id))).first()
 
     return CarDetailResponse(
         id=car.id,
@@ -219,9 +251,13 @@ def delete_car(
 ):
     car = _get_car_or_404(db, car_id)
 
-    has_income = db.query(CarIncome.id).filter(CarIncome.car_id == car_id).first() is not None
-    has_expense = db.query(CarExpense.id).filter(CarExpense.car_id == car_id).first() is not None
-    if has_income or has_expense:
+    has_financial_records = db.query(
+        or_(
+            exists().where(CarIncome.car_id == car_id),
+            exists().where(CarExpense.car_id == car_id),
+        )
+    ).scalar()
+    if has_financial_records:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Car cannot be deleted because it has financial records",
@@ -244,6 +280,7 @@ def delete_car(
             new_value=None,
         )
         db.commit()
+        invalidate_car_financials_cache(car_id)
         return {"message": "Car deleted successfully"}
     except IntegrityError:
         db.rollback()
@@ -258,7 +295,7 @@ def upsert_maintenance(
     current_user: User = Depends(get_current_user),
 ):
     _require_cars_full(db=db, current_user=current_user)
-    _get_car_or_404(db, car_id)
+    _ensure_car_exists(db, car_id)
 
     maintenance = db.query(CarMaintenance).filter(CarMaintenance.car_id == car_id).first()
     old_snapshot = None
@@ -316,7 +353,7 @@ def add_income(
     current_user: User = Depends(get_current_user),
 ):
     _require_cars_full(db=db, current_user=current_user)
-    _get_car_or_404(db, car_id)
+    _ensure_car_exists(db, car_id)
 
     income = CarIncome(
         car_id=car_id,
@@ -328,6 +365,7 @@ def add_income(
     )
     db.add(income)
     db.commit()
+    invalidate_car_financials_cache(car_id)
     db.refresh(income)
     return income
 
@@ -340,7 +378,7 @@ def add_expense(
     current_user: User = Depends(get_current_user),
 ):
     _require_cars_full(db=db, current_user=current_user)
-    _get_car_or_404(db, car_id)
+    _ensure_car_exists(db, car_id)
 
     expense = CarExpense(
         car_id=car_id,
@@ -351,41 +389,58 @@ def add_expense(
     )
     db.add(expense)
     db.commit()
+    invalidate_car_financials_cache(car_id)
     db.refresh(expense)
     return expense
 
 
-@router.get("/{car_id}/financials", response_model=CarFinancialsResponse)
-def get_financials(
+@router.get("/{car_id}/financials", response_model=CarFinancialsResponse, response_class=ORJSONResponse)
+async def get_financials(
     car_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
-    _require_cars_permission(db=db, current_user=current_user)
-    _get_car_or_404(db, car_id)
+    await _require_cars_permission_async(db=db, current_user=current_user)
+    cached = _car_financials_cache.get(car_id)
+    if cached is not None:
+        return cached
+
+    # Existence check and both totals in one round-trip.
+    car_exists, total_income, total_expenses = (
+        await db.execute(
+            select(
+                exists().where(Car.id == car_id),
+                select(func.coalesce(func.sum(CarIncome.amount), 0)).where(CarIncome.car_id == car_id).scalar_subquery(),
+                select(func.coalesce(func.sum(CarExpense.amount), 0)).where(CarExpense.car_id == car_id).scalar_subquery(),
+            )
+        )
+    ).one()
+    if not car_exists:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Car not found")
 
     incomes = (
-        db.query(CarIncome)
-        .filter(CarIncome.car_id == car_id)
-        .order_by(CarIncome.transaction_date.desc(), CarIncome.created_at.desc())
-        .all()
-    )
+        await db.scalars(
+            select(CarIncome)
+            .where(CarIncome.car_id == car_id)
+            .order_by(CarIncome.transaction_date.desc(), CarIncome.created_at.desc())
+        )
+    ).all()
     expenses = (
-        db.query(CarExpense)
-        .filter(CarExpense.car_id == car_id)
-        .order_by(CarExpense.transaction_date.desc(), CarExpense.created_at.desc())
-        .all()
-    )
-
-    total_income = db.query(func.coalesce(func.sum(CarIncome.amount), 0)).filter(CarIncome.car_id == car_id).scalar()
-    total_expenses = db.query(func.coalesce(func.sum(CarExpense.amount), 0)).filter(CarExpense.car_id == car_id).scalar()
+        await db.scalars(
+            select(CarExpense)
+            .where(CarExpense.car_id == car_id)
+            .order_by(CarExpense.transaction_date.desc(), CarExpense.created_at.desc())
+        )
+    ).all()
     total_income = Decimal(total_income or 0)
     total_expenses = Decimal(total_expenses or 0)
 
-    return CarFinancialsResponse(
+    financials = CarFinancialsResponse(
         incomes=incomes,
         expenses=expenses,
         total_income=total_income,
         total_expenses=total_expenses,
         profit=total_income - total_expenses,
     )
+    _car_financials_cache.set(car_id, financials)
+    return financials
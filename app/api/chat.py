@@ -4,7 +4,9 @@ import json
 from uuid import UUID
 
 import sqlalchemy as sa
-from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.core.database import SessionLocal, get_db
@@ -29,6 +31,16 @@ from app.utils.connection_manager import connection_manager
 
 router = APIRouter(prefix="/chat", tags=["Chat"])
 
+# Direct threads store their pair normalized as (min, max) under the partial unique index
+# uq_chat_threads_direct_pair, whose predicate matches this WHERE, so the lookup is a
+# single-row index probe. Built once at import so every call reuses
+# the same statement and its cached compiled SQL.
+_DIRECT_THREAD_LOOKUP = sa.select(ChatThread).where(
+    ChatThread.is_group.is_(False),
+    ChatThread.user_one_id == sa.bindparam("user_one_id"),
+    ChatThread.user_two_id == sa.bindparam("user_two_id"),
+)
+
 
 def _get_user_from_token(db: Session, token: str) -> User | None:
     payload = decode_token(token)
@@ -44,15 +56,13 @@ def _get_user_from_token(db: Session, token: str) -> User | None:
 
 
 def _is_thread_member(db: Session, thread_id: UUID, user_id: UUID) -> bool:
-    membership = (
-        db.query(ChatThreadMember.id)
-        .filter(
+    # Answered from ix_chat_thread_members_thread_user without returning a row.
+    return db.query(
+        sa.exists().where(
             ChatThreadMember.thread_id == thread_id,
             ChatThreadMember.user_id == user_id,
         )
-        .first()
-    )
-    return membership is not None
+    ).scalar()
 
 
 def _serialize_chat_message(message: ChatMessage) -> dict:
@@ -94,6 +104,7 @@ def _thread_response(db: Session, thread: ChatThread) -> ChatThreadResponse:
         is_group=thread.is_group,
         group_name=thread.group_name,
         created_at=thread.created_at,
+        last_message_at=thread.last_message_at,
         members=_thread_members(db, thread.id),
     )
 
@@ -112,7 +123,7 @@ def create_thread(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="group_name is required for group threads")
 
     requested_users = (
-        db.query(User.id)
+        db.query(User.id, User.first_name, User.last_name, User.email)
         .filter(User.id.in_(list(unique_member_ids)))
         .all()
         if unique_member_ids
@@ -122,23 +133,16 @@ def create_thread(
     if found_ids != unique_member_ids:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="One or more members do not exist")
 
+    member_ids = list(unique_member_ids | {current_user.id})
+
     if not payload.is_group:
-        other_user_id = next(iter(unique_member_ids))
-        existing_threads = (
-            db.query(ChatThread.id)
-            .join(ChatThreadMember, ChatThreadMember.thread_id == ChatThread.id)
-            .filter(ChatThread.is_group.is_(False), ChatThreadMember.user_id.in_([current_user.id, other_user_id]))
-            .group_by(ChatThread.id)
-            .having(sa.func.count(sa.distinct(ChatThreadMember.user_id)) == 2)
-            .all()
-        )
-        if existing_threads:
-            existing_id = existing_threads[0][0]
-            existing_thread = db.query(ChatThread).filter(ChatThread.id == existing_id).first()
-            if existing_thread:
-                return _thread_response(db, existing_thread)
+        existing_thread = db.execute(
+            _DIRECT_THREAD_LOOKUP,
+            {"user_one_id": min(member_ids), "user_two_id": max(member_ids)},
+        ).scalar_one_or_none()
+        if existing_thread:
+            return _thread_response(db, existing_thread)
 
-    member_ids = list(unique_member_ids | {current_user.id})
     thread = ChatThread(
         user_one_id=min(member_ids),
         user_two_id=max(member_ids),
@@ -147,17 +151,51 @@ def create_thread(
         created_by=current_user.id,
     )
     db.add(thread)
-    db.flush()
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        if payload.is_group:
+            raise
+        # A concurrent request created the same direct thread between the lookup and
+        # the insert; the unique index made us wait for it to commit, so it is visible now.
+        existing_thread = db.execute(
+            _DIRECT_THREAD_LOOKUP,
+            {"user_one_id": min(member_ids), "user_two_id": max(member_ids)},
+        ).scalar_one()
+        return _thread_response(db, existing_thread)
 
     for member_id in member_ids:
         db.add(ChatThreadMember(thread_id=thread.id, user_id=member_id))
 
     db.commit()
-    db.refresh(thread)
-    return _thread_response(db, thread)
+
+    # The member rows were just written from users already loaded above, and created_at
+    # comes back via RETURNING, so the response needs no further round-trips.
+    members = [
+        ChatThreadMemberResponse(user_id=row[0], first_name=row[1], last_name=row[2], email=row[3])
+        for row in requested_users
+    ]
+    members.append(
+        ChatThreadMemberResponse(
+            user_id=current_user.id,
+            first_name=current_user.first_name,
+            last_name=current_user.last_name,
+            email=current_user.email,
+        )
+    )
+    members.sort(key=lambda member: (member.first_name or "", member.last_name or ""))
+    return ChatThreadResponse(
+        id=thread.id,
+        is_group=thread.is_group,
+        group_name=thread.group_name,
+        created_at=thread.created_at,
+        last_message_at=None,
+        members=members,
+    )
 
 
-@router.get("/threads", response_model=ChatThreadListResponse)
+@router.get("/threads", response_model=ChatThreadListResponse, response_class=ORJSONResponse)
 def list_threads(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
@@ -166,13 +204,46 @@ def list_threads(
         db.query(ChatThread)
         .join(ChatThreadMember, ChatThreadMember.thread_id == ChatThread.id)
         .filter(ChatThreadMember.user_id == current_user.id)
-        .order_by(ChatThread.created_at.desc())
+        .order_by(ChatThread.last_message_at.desc().nullslast(), ChatThread.created_at.desc())
         .all()
     )
-    return ChatThreadListResponse(threads=[_thread_response(db, thread) for thread in threads])
+
+    # Members for every listed thread in one query rather than one per thread.
+    members_by_thread: dict[UUID, list[ChatThreadMemberResponse]] = {thread.id: [] for thread in threads}
+    if threads:
+        rows = (
+            db.query(ChatThreadMember.thread_id, User.id, User.first_name, User.last_name, User.email)
+            .join(User, User.id == ChatThreadMember.user_id)
+            .filter(ChatThreadMember.thread_id.in_(list(members_by_thread)))
+            .order_by(User.first_name.asc(), User.last_name.asc())
+            .all()
+        )
+        for row in rows:
+            members_by_thread[row[0]].append(
+                ChatThreadMemberResponse(
+                    user_id=row[1],
+                    first_name=row[2],
+                    last_name=row[3],
+                    email=row[4],
+                )
+            )
+
+    return ChatThreadListResponse(
+        threads=[
+            ChatThreadResponse(
+                id=thread.id,
+                is_group=thread.is_group,
+                group_name=thread.group_name,
+                created_at=thread.created_at,
+                last_message_at=thread.last_message_at,
+                members=members_by_thread[thread.id],
+            )
+            for thread in threads
+        ]
+    )
 
 
-@router.get("/threads/{thread_id}/messages", response_model=ChatMessageListResponse)
+@router.get("/threads/{thread_id}/messages", response_model=ChatMessageListResponse, response_class=ORJSONResponse)
 def list_thread_messages(
     thread_id: UUID,
     db: Session = Depends(get_db),
@@ -181,156 +252,155 @@ def list_thread_messages(
     if not _is_thread_member(db, thread_id, current_user.id):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You do not have access to this thread")
 
+    # Column rows validated straight into the response model: no ChatMessage objects,
+    # no identity map, no per-row field copying.
     messages = (
-        db.query(ChatMessage)
+        db.query(
+            ChatMessage.id,
+            ChatMessage.thread_id,
+            ChatMessage.sender_user_id,
+            ChatMessage.message_text,
+            ChatMessage.file_id,
+            ChatMessage.message_type,
+            ChatMessage.approval_status,
+            ChatMessage.is_read,
+            ChatMessage.created_at,
+        )
         .filter(ChatMessage.thread_id == thread_id)
         .order_by(ChatMessage.created_at.asc())
         .all()
     )
-    return ChatMessageListResponse(
-        messages=[
-            ChatMessageResponse(
-                id=message.id,
-                thread_id=message.thread_id,
-                sender_user_id=message.sender_user_id,
-                message_text=message.message_text,
-                file_id=message.file_id,
-                message_type=message.message_type or "text",
-                approval_status=message.approval_status,
-                is_read=message.is_read,
-                created_at=message.created_at,
-            )
-            for message in messages
-        ]
-    )
+    return ChatMessageListResponse(messages=messages)
 
 
-@router.post("/threads/{thread_id}/messages", response_model=ChatMessageResponse, status_code=status.HTTP_201_CREATED)
-async def create_thread_message(
+def _insert_thread_message(
+    db: Session,
+    *,
     thread_id: UUID,
-    payload: CreateMessageRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-):
+    current_user: User,
+    message_text: str | None,
+    message_type: str,
+    approval_status: str | None,
+) -> ChatMessage:
     if not _is_thread_member(db, thread_id, current_user.id):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You do not have access to this thread")
 
-    thread = db.query(ChatThread).filter(ChatThread.id == thread_id).first()
-    if not thread:
+    # Touch the thread with a single UPDATE instead of loading it and flushing it dirty;
+    # the rowcount doubles as the existence check. NOW() is the transaction timestamp,
+    # so last_message_at matches the message's created_at.
+    touched = db.execute(
+        sa.update(ChatThread).where(ChatThread.id == thread_id).values(last_message_at=sa.func.now())
+    ).rowcount
+    if not touched:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Thread not found")
 
     message = ChatMessage(
         thread_id=thread_id,
         sender_user_id=current_user.id,
-        message_text=payload.message_text.strip() if payload.message_text else None,
-        message_type=(payload.message_type or "text").strip() or "text",
-        approval_status=None,
+        message_text=message_text,
+        message_type=message_type,
+        approval_status=approval_status,
         is_read=False,
     )
     db.add(message)
     db.commit()
-    db.refresh(message)
+    return message
+
+
+def _update_approval_status(db: Session, *, message_id: UUID, current_user: User, new_status: str) -> ChatMessage:
+    message = db.query(ChatMessage).filter(ChatMessage.id == message_id).first()
+    if not message:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Message not found")
+
+    if str(message.sender_user_id) == str(current_user.id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Sender cannot approve their own request")
+
+    if not _is_thread_member(db, message.thread_id, current_user.id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You do not have access to this thread")
+
+    message.approval_status = new_status
+    db.add(message)
+    db.commit()
+    return message
+
+
+# Plain `def` handlers: FastAPI runs them in the threadpool, off the event loop. The
+# websocket fan-out is queued as a background task so the HTTP response goes out
+# without waiting on every connected socket; it needs no DB session.
+@router.post("/threads/{thread_id}/messages", response_model=ChatMessageResponse, status_code=status.HTTP_201_CREATED)
+def create_thread_message(
+    thread_id: UUID,
+    payload: CreateMessageRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    message = _insert_thread_message(
+        db,
+        thread_id=thread_id,
+        current_user=current_user,
+        message_text=payload.message_text.strip() if payload.message_text else None,
+        message_type=(payload.message_type or "text").strip() or "text",
+        approval_status=None,
+    )
 
-    await connection_manager.broadcast_to_thread(
+    background_tasks.add_task(
+        connection_manager.broadcast_to_thread,
         thread_id=str(thread_id),
         payload={"type": "new_message", "message": _serialize_chat_message(message)},
     )
 
-    return ChatMessageResponse(
-        id=message.id,
-        thread_id=message.thread_id,
-        sender_user_id=message.sender_user_id,
-        message_text=message.message_text,
-        file_id=message.file_id,
-        message_type=message.message_type or "text",
-        approval_status=message.approval_status,
-        is_read=message.is_read,
-        created_at=message.created_at,
-    )
+    return ChatMessageResponse.model_validate(message)
 
 
 @router.post("/threads/{thread_id}/approval-request", response_model=ChatMessageResponse, status_code=status.HTTP_201_CREATED)
-async def create_approval_request(
+def create_approval_request(
     thread_id: UUID,
     payload: ApprovalRequestCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    if not _is_thread_member(db, thread_id, current_user.id):
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You do not have access to this thread")
-
-    thread = db.query(ChatThread).filter(ChatThread.id == thread_id).first()
-    if not thread:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Thread not found")
-
-    message = ChatMessage(
+    message = _insert_thread_message(
+        db,
         thread_id=thread_id,
-        sender_user_id=current_user.id,
+        current_user=current_user,
         message_text=f"{payload.request_type}|{payload.title}|{payload.description}",
         message_type="approval",
         approval_status="pending",
-        is_read=False,
     )
-    db.add(message)
-    db.commit()
-    db.refresh(message)
 
-    await connection_manager.broadcast_to_thread(
+    background_tasks.add_task(
+        connection_manager.broadcast_to_thread,
         thread_id=str(thread_id),
         payload={"type": "new_message", "message": _serialize_chat_message(message)},
     )
 
-    return ChatMessageResponse(
-        id=message.id,
-        thread_id=message.thread_id,
-        sender_user_id=message.sender_user_id,
-        message_text=message.message_text,
-        file_id=message.file_id,
-        message_type=message.message_type,
-        approval_status=message.approval_status,
-        is_read=message.is_read,
-        created_at=message.created_at,
-    )
+    return ChatMessageResponse.model_validate(message)
 
 
 @router.patch("/messages/{message_id}/approval", response_model=ChatMessageResponse)
-async def patch_approval_status(
+def patch_approval_status(
     message_id: UUID,
     payload: ApprovalStatusPatch,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    message = db.query(ChatMessage).filter(ChatMessage.id == message_id).first()
-    if not message:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Message not found")
-
-    if str(message.sender_user_id) == str(current_user.id):
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Sender cannot approve their own request")
-
-    if not _is_thread_member(db, message.thread_id, current_user.id):
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You do not have access to this thread")
-
-    message.approval_status = payload.status
-    db.add(message)
-    db.commit()
-    db.refresh(message)
+    message = _update_approval_status(
+        db,
+        message_id=message_id,
+        current_user=current_user,
+        new_status=payload.status,
+    )
 
-    await connection_manager.broadcast_to_thread(
+    background_tasks.add_task(
+        connection_manager.broadcast_to_thread,
         thread_id=str(message.thread_id),
         payload={"type": "message_updated", "message": _serialize_chat_message(message)},
     )
 
-    return ChatMessageResponse(
-        id=message.id,
-        thread_id=message.thread_id,
-        sender_user_id=message.sender_user_id,
-        message_text=message.message_text,
-        file_id=message.file_id,
-        message_type=message.message_type or "text",
-        approval_status=message.approval_status,
-        is_read=message.is_read,
-        created_at=message.created_at,
-    )
+    return ChatMessageResponse.model_validate(message)
 
 
 @router.websocket("/ws/chat/{thread_id}")
@@ -359,6 +429,10 @@ async def ws_chat(websocket: WebSocket, thread_id: str):
             await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
             return
 
+        # The socket may stay open for hours; hand the pooled connection back now
+        # instead of holding it idle-in-transaction for the socket's lifetime.
+        db.close()
+
         user_id_str = str(user.id)
         await connection_manager.connect_chat(thread_id=str(thread_uuid), user_id=user_id_str, websocket=websocket)
 
@@ -2,13 +2,14 @@ from typing import Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy import inspect, text
+from sqlalchemy import exists, func, inspect, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
+from app.core.database import engine, get_db
 from app.core.deps import get_current_user, require_admin
 from app.models.company import Company
+from app.models.payment import Payment
 from app.models.project import Project
 from app.models.task import Task
 from app.models.user import User
@@ -47,18 +48,22 @@ def _require_companies_read(db: Session, current_user: User) -> None:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You do not have permission to access Companies")
 
 
-def _table_exists(db: Session, table_name: str) -> bool:
-    inspector = inspect(db.get_bind())
-    return table_name in inspector.get_table_names()
+# Which optional tables exist is a property of the deployed schema, so it is resolved once
+# (primed at startup) instead of with a catalog query on every delete. Migrations that add
+# or drop these tables ship with a restart.
+_existing_table_names: Optional[frozenset[str]] = None
 
 
-def _has_payment_or_car_reference(db: Session, *, table_name: str, company_id: UUID) -> bool:
-    if not _table_exists(db, table_name):
-        return False
+def load_existing_tables(bind=None) -> frozenset[str]:
+    global _existing_table_names
+    _existing_table_names = frozenset(inspect(bind if bind is not None else engine).get_table_names())
+    return _existing_table_names
 
-    stmt = text(f"SELECT 1 FROM {table_name} WHERE company_id = :company_id LIMIT 1")
-    row = db.execute(stmt, {"company_id": company_id}).first()
-    return row is not None
+
+def _existing_tables(db: Session) -> frozenset[str]:
+    if _existing_table_names is None:
+        return load_existing_tables(db.get_bind())
+    return _existing_table_names
 
 
 @router.post("/companies", response_model=CompanyResponse, status_code=status.HTTP_201_CREATED)
@@ -134,7 +139,7 @@ def list_companies(
     if name_search:
         query = query.filter(Company.name.ilike(f"%{name_search}%"))
 
-    total = query.count()
+    total = query.with_entities(func.count(Company.id)).scalar()
     companies = (
         query.order_by(Company.name.asc()).offset((page - 1) * page_size).limit(page_size).all()
     )
@@ -234,18 +239,18 @@ def delete_company(
     if not company:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Company not found")
 
+    # Every reference check as one SELECT of EXISTS columns: one round-trip, each probe
+    # still stops at the first matching row.
+    tables = _existing_tables(db)
+    reference_checks = {
+        source: exists().where(model.company_id == id)
+        for source, model in (("tasks", Task), ("projects", Project), ("payments", Payment))
+        if model.__tablename__ in tables
+    }
     reference_sources: list[str] = []
-
-    has_tasks = _table_exists(db, "tasks") and db.query(Task.id).filter(Task.company_id == id).first() is not None
-    if has_tasks:
-        reference_sources.append("tasks")
-
-    has_projects = _table_exists(db, "projects") and db.query(Project.id).filter(Project.company_id == id).first() is not None
-    if has_projects:
-        reference_sources.append("projects")
-
-    if _has_payment_or_car_reference(db, table_name="payments", company_id=id):
-        reference_sources.append("payments")
+    if reference_checks:
+        found = db.execute(select(*reference_checks.values())).one()
+        reference_sources = [source for source, present in zip(reference_checks, found) if present]
 
     if reference_sources:
         raise HTTPException(
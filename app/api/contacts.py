@@ -3,8 +3,9 @@ from io import StringIO
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import func, or_
 
 from app.core.database import get_db
 from app.core.deps import get_current_user
@@ -99,7 +100,7 @@ def list_contacts(
             )
         )
 
-    total = query.count()
+    total = query.with_entities(func.count(Contact.id)).scalar()
     contacts = (
         query.order_by(Contact.created_at.desc())
         .offset((page - 1) * page_size)
@@ -261,6 +262,20 @@ async def import_contacts_csv(
     """
     raw = await file.read()
 
+    # Decoding, parsing and the insert are all blocking; run them off the event loop so
+    # a large import does not stall every other request on this worker.
+    imported, skipped, encoding_used = await run_in_threadpool(
+        _import_contacts, db, current_user=current_user, raw=raw
+    )
+
+    resp = {"imported": imported, "skipped": skipped}
+    if encoding_used != "utf-8":
+        resp["warning"] = "Non-UTF8 encoding detected; CSV was decoded using Windows-1253."
+
+    return resp
+
+
+def _import_contacts(db: Session, *, current_user: User, raw: bytes) -> tuple[int, int, str]:
     encoding_used = "utf-8"
     try:
         text = raw.decode("utf-8")
@@ -304,9 +319,5 @@ async def import_contacts_csv(
 
     db.commit()
 
-    resp = {"imported": imported, "skipped": skipped}
-    if encoding_used != "utf-8":
-        resp["warning"] = "Non-UTF8 encoding detected; CSV was decoded using Windows-1253."
-
-    return resp
+    return imported, skipped, encoding_used
 
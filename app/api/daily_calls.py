@@ -1,17 +1,15 @@
 import logging
-import os
-import uuid
+import secrets
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, func
 
 from app.core.database import get_db
 from app.core.deps import get_current_user
-from app.core.config import settings
 from app.models.user import User
 from app.models.contact import Contact
 from app.models.daily_call import DailyCall
@@ -27,6 +25,7 @@ from app.services.daily_call_reminder_service import (
     REMINDER_5_TITLE,
 )
 from app.models.notification import Notification
+from app.utils.uploads import UPLOAD_DIR, save_upload
 
 
 logger = logging.getLogger(__name__)
@@ -35,12 +34,7 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/daily-calls", tags=["Daily Calls"])
 
 MAX_CALL_NOTE_FILE_SIZE_BYTES = 20 * 1024 * 1024
-
-
-def _ensure_upload_dir() -> Path:
-    upload_dir = Path(settings.UPLOAD_DIR)
-    upload_dir.mkdir(parents=True, exist_ok=True)
-    return upload_dir
+CALL_NOTE_FILE_TOO_LARGE_DETAIL = "File size exceeds maximum allowed size (20MB)"
 
 
 def _create_document_from_bytes(
@@ -51,18 +45,38 @@ def _create_document_from_bytes(
     original_filename: str,
     mime_type: str,
 ) -> Document:
-    upload_dir = _ensure_upload_dir()
 
-    storage_uuid = str(uuid.uuid4())
-    storage_path = upload_dir / storage_uuid
+    storage_name = secrets.token_hex(16)
+    storage_path = UPLOAD_DIR / storage_name
 
     with open(storage_path, "wb") as f:
         f.write(file_bytes)
 
+    return _add_document(
+        db=db,
+        current_user=current_user,
+        storage_name=storage_name,
+        storage_path=storage_path,
+        file_size=len(file_bytes),
+        original_filename=original_filename,
+        mime_type=mime_type,
+    )
+
+
+def _add_document(
+    *,
+    db: Session,
+    current_user: User,
+    storage_name: str,
+    storage_path: Path,
+    file_size: int,
+    original_filename: str,
+    mime_type: str,
+) -> Document:
     doc = Document(
-        filename=storage_uuid,
+        filename=storage_name,
         original_filename=original_filename,
-        file_size_bytes=len(file_bytes),
+        file_size_bytes=file_size,
         mime_type=mime_type,
         storage_path=str(storage_path),
         uploaded_by_user_id=current_user.id,
@@ -132,7 +146,7 @@ def list_daily_calls(
     List current user's scheduled calls only, sorted by next_call_at ASC.
     """
     query = db.query(DailyCall).filter(DailyCall.user_id == current_user.id)
-    total = query.count()
+    total = query.with_entities(func.count(DailyCall.id)).scalar()
 
     daily_calls = (
         query.order_by(DailyCall.next_call_at.asc())
@@ -221,8 +235,8 @@ def delete_daily_call(
         # Remove from disk best-effort.
         for doc in docs:
             try:
-                if doc.storage_path and os.path.exists(doc.storage_path):
-                    os.remove(doc.storage_path)
+                if doc.storage_path:
+                    Path(doc.storage_path).unlink(missing_ok=True)
             except OSError:
                 logger.exception("Failed removing stored document file")
 
@@ -299,21 +313,25 @@ async def upload_call_notes_file(
     if not daily_call:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You do not have access to this daily call")
 
-    file_bytes = await file.read()
-    if len(file_bytes) > MAX_CALL_NOTE_FILE_SIZE_BYTES:
-        raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail="File size exceeds maximum allowed size (20MB)",
-        )
+    storage_name = secrets.token_hex(16)
+    storage_path = UPLOAD_DIR / storage_name
+    file_size = await save_upload(
+        file,
+        storage_path,
+        max_bytes=MAX_CALL_NOTE_FILE_SIZE_BYTES,
+        too_large_detail=CALL_NOTE_FILE_TOO_LARGE_DETAIL,
+    )
 
     now = _now_utc()
     original_filename = file.filename or f"call_notes_{daily_call.id}.doc"
     mime_type = file.content_type or "application/msword"
 
-    doc = _create_document_from_bytes(
+    doc = _add_document(
         db=db,
         current_user=current_user,
-        file_bytes=file_bytes,
+        storage_name=storage_name,
+        storage_path=storage_path,
+        file_size=file_size,
         original_filename=original_filename,
         mime_type=mime_type,
     )
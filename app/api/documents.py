@@ -1,32 +1,31 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
-from fastapi.responses import StreamingResponse
+from fastapi.responses import FileResponse, Response
+from sqlalchemy import and_, desc, func, tuple_
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
-import uuid
 import os
+import secrets
 from pathlib import Path
+from urllib.parse import quote
+from typing import Optional
+from uuid import UUID
 
+from app.core.config import settings
 from app.core.database import get_db
 from app.core.deps import get_current_user, require_admin
-from app.core.config import settings
 from app.models.user import User
 from app.models.document import Document
 from app.models.call_notes_file import CallNotesFile
 from app.models.daily_call import DailyCall
 from app.schemas.document import DocumentResponse, DocumentListResponse
 from app.utils.activity_logger import log_activity
+from app.utils.uploads import UPLOAD_DIR, save_upload
 from datetime import datetime, timezone
 
 router = APIRouter(prefix="/documents", tags=["Documents"])
 
 MAX_FILE_SIZE = 100 * 1024 * 1024
-
-
-def ensure_upload_dir():
-    """Ensure upload directory exists."""
-    upload_dir = Path(settings.UPLOAD_DIR)
-    upload_dir.mkdir(parents=True, exist_ok=True)
-    return upload_dir
-
+FILE_TOO_LARGE_DETAIL = f"File size exceeds maximum allowed size of {MAX_FILE_SIZE / (1024 * 1024)}MB"
 
 @router.post("", response_model=DocumentResponse, status_code=status.HTTP_201_CREATED)
 async def upload_document(
@@ -38,23 +37,14 @@ async def upload_document(
     Upload a document.
     Any authenticated user can upload.
     """
-    file_content = await file.read()
-    file_size = len(file_content)
-    
-    if file_size > MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail=f"File size exceeds maximum allowed size of {MAX_FILE_SIZE / (1024 * 1024)}MB"
-        )
-    
-    upload_dir = ensure_upload_dir()
-    
-    file_uuid = str(uuid.uuid4())
-    storage_filename = file_uuid
-    storage_path = upload_dir / storage_filename
-    
-    with open(storage_path, "wb") as f:
-        f.write(file_content)
+    storage_filename = secrets.token_hex(16)
+    storage_path = UPLOAD_DIR / storage_filename
+    file_size = await save_upload(
+        file,
+        storage_path,
+        max_bytes=MAX_FILE_SIZE,
+        too_large_detail=FILE_TOO_LARGE_DETAIL
+    )
     
     document = Document(
         filename=storage_filename,
@@ -65,8 +55,14 @@ async def upload_document(
         uploaded_by_user_id=current_user.id # Strict owner derivation
     )
     
-    db.add(document)
-    db.commit()
+    try:
+        db.add(document)
+        db.commit()
+    except SQLAlchemyError:
+        # Don't leave an orphaned file behind when the row could not be stored.
+        db.rollback()
+        storage_path.unlink(missing_ok=True)
+        raise
     db.refresh(document)
     
     # Activity Log
@@ -92,17 +88,47 @@ async def upload_document(
 def list_documents(
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=100),
+    before_created_at: Optional[datetime] = Query(None, description="Keyset cursor: created_at of the last item seen"),
+    before_id: Optional[UUID] = Query(None, description="Keyset cursor: id of the last item seen"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     List all documents.
     All users can see all documents (public visibility).
+
+    Pass the `created_at`/`id` of the last document received as
+    `before_created_at`/`before_id` to fetch the next page as an index seek;
+    `page` is ignored when a cursor is given.
     """
+    if (before_created_at is None) != (before_id is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="before_created_at and before_id must be provided together"
+        )
+
     query = db.query(Document)
     
-    total = query.count()
-    documents = query.order_by(Document.created_at.desc()).offset((page - 1) * page_size).limit(page_size).all()
+    total = query.with_entities(func.count(Document.id)).scalar()
+    # Rows of exactly the DocumentResponse columns: no Document objects or identity map.
+    query = query.with_entities(
+        Document.id,
+        Document.filename,
+        Document.original_filename,
+        Document.file_size_bytes,
+        Document.mime_type,
+        Document.storage_path,
+        Document.uploaded_by_user_id,
+        Document.created_at,
+        Document.updated_at,
+    ).order_by(desc(Document.created_at), desc(Document.id))
+    if before_created_at is not None:
+        query = query.filter(
+            tuple_(Document.created_at, Document.id) < tuple_(before_created_at, before_id)
+        )
+    else:
+        query = query.offset((page - 1) * page_size)
+    documents = query.limit(page_size).all()
     
     return DocumentListResponse(
         documents=documents,
@@ -112,6 +138,14 @@ def list_documents(
     )
 
 
+def _attachment_disposition(filename: str) -> str:
+    # Same encoding FileResponse uses: RFC 5987 filename* for non-ASCII names.
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+
 @router.get("/{document_id}")
 def download_document(
     document_id: str,
@@ -122,7 +156,12 @@ def download_document(
     Download a document.
     All users can download all documents.
     """
-    document = db.query(Document).filter(Document.id == document_id).first()
+    # Only the columns the response needs; no Document object is hydrated.
+    document = (
+        db.query(Document.id, Document.filename, Document.storage_path, Document.mime_type, Document.original_filename)
+        .filter(Document.id == document_id)
+        .first()
+    )
     
     if not document:
         raise HTTPException(
@@ -134,56 +173,55 @@ def download_document(
     # If this document is linked to any call note for a DailyCall, enforce:
     # - only the daily-call owner can download it
     # - expired notes return 410 Gone
+    # All three link checks are answered by one aggregate over the document's call-note links.
     now = datetime.now(timezone.utc)
-    has_valid_call_note_link = (
-        db.query(CallNotesFile.id)
-        .join(DailyCall, DailyCall.id == CallNotesFile.daily_call_id)
-        .filter(
-            CallNotesFile.file_id == document.id,
-            DailyCall.user_id == current_user.id,
-            CallNotesFile.expires_at >= now,
+    is_own_link = DailyCall.user_id == current_user.id
+    call_note_links, has_any_call_note_link_for_user, has_valid_call_note_link = (
+        db.query(
+            func.count(CallNotesFile.id),
+            func.bool_or(is_own_link),
+            func.bool_or(and_(is_own_link, CallNotesFile.expires_at >= now)),
         )
-        .first()
-        is not None
+        .outerjoin(DailyCall, DailyCall.id == CallNotesFile.daily_call_id)
+        .filter(CallNotesFile.file_id == document.id)
+        .one()
     )
 
     if not has_valid_call_note_link:
-        has_any_call_note_link_for_user = (
-            db.query(CallNotesFile.id)
-            .join(DailyCall, DailyCall.id == CallNotesFile.daily_call_id)
-            .filter(
-                CallNotesFile.file_id == document.id,
-                DailyCall.user_id == current_user.id,
-            )
-            .first()
-            is not None
-        )
-
         if has_any_call_note_link_for_user:
             raise HTTPException(status_code=status.HTTP_410_GONE, detail="Call notes file expired")
 
         # The document is a call note for someone else.
-        has_any_call_note_link_any_user = db.query(CallNotesFile.id).filter(CallNotesFile.file_id == document.id).first()
-        if has_any_call_note_link_any_user:
+        if call_note_links:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You do not have access to this file")
     
-    if not os.path.exists(document.storage_path):
+    if settings.DOWNLOAD_ACCEL_METHOD != "none":
+        # Header-only response; the proxy streams the file from disk itself and
+        # answers 404 if it is missing.
+        headers = {"Content-Disposition": _attachment_disposition(document.original_filename)}
+        if settings.DOWNLOAD_ACCEL_METHOD == "xaccel":
+            headers["X-Accel-Redirect"] = settings.DOWNLOAD_ACCEL_PREFIX + quote(document.filename)
+        else:
+            headers["X-Sendfile"] = str(Path(document.storage_path).resolve())
+        return Response(media_type=document.mime_type, headers=headers)
+
+    # One stat per download: it doubles as the existence check and is handed to
+    # FileResponse, which would otherwise stat the file again before sending.
+    try:
+        stat_result = os.stat(document.storage_path)
+    except FileNotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="File not found on disk"
         )
     
-    def file_iterator():
-        with open(document.storage_path, "rb") as f:
-            while chunk := f.read(8192):
-                yield chunk
-    
-    return StreamingResponse(
-        file_iterator(),
+    # FileResponse hands the path to the server via the ASGI pathsend extension when it is
+    # offered (sendfile(2), no userspace copy) and otherwise streams it in large chunks.
+    return FileResponse(
+        document.storage_path,
         media_type=document.mime_type,
-        headers={
-            "Content-Disposition": f'attachment; filename="{document.original_filename}"'
-        }
+        filename=document.original_filename,
+        stat_result=stat_result,
     )
 
 
@@ -215,8 +253,7 @@ def delete_document(
         "uploaded_by_user_id": str(document.uploaded_by_user_id)
     }
 
-    if os.path.exists(document.storage_path):
-        os.remove(document.storage_path)
+    Path(document.storage_path).unlink(missing_ok=True)
     
     db.delete(document)
     db.commit()
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from typing import Optional
 from datetime import datetime, timezone
@@ -88,7 +89,7 @@ def list_events(
     if to_date:
         query = query.filter(Event.event_start_at <= to_date)
     
-    total = query.count()
+    total = query.with_entities(func.count(Event.id)).scalar()
     events = query.order_by(Event.event_start_at).offset((page - 1) * page_size).limit(page_size).all()
     
     return EventListResponse(
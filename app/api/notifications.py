@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, func, tuple_, update
 from typing import Optional
+from datetime import datetime
 from uuid import UUID
 
 from app.core.database import get_db
@@ -17,22 +18,38 @@ def list_notifications(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=50),
     read_status: Optional[str] = Query(None, description="Filter by read_status (Unread/Read)"),
+    before_created_at: Optional[datetime] = Query(None, description="Keyset cursor: created_at of the last item seen"),
+    before_id: Optional[UUID] = Query(None, description="Keyset cursor: id of the last item seen"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     List notifications for current user.
+
+    Pass the `created_at`/`id` of the last notification received as
+    `before_created_at`/`before_id` to fetch the next page as an index seek;
+    `page` is ignored when a cursor is given.
     """
+    if (before_created_at is None) != (before_id is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="before_created_at and before_id must be provided together"
+        )
+
     query = db.query(Notification).filter(Notification.recipient_user_id == current_user.id)
     
     if read_status:
         query = query.filter(Notification.read_status == read_status)
     
-    total = query.count()
-    notifications = query.order_by(desc(Notification.created_at))\
-                         .offset((page - 1) * page_size)\
-                         .limit(page_size)\
-                         .all()
+    total = query.with_entities(func.count(Notification.id)).scalar()
+    query = query.order_by(desc(Notification.created_at), desc(Notification.id))
+    if before_created_at is not None:
+        query = query.filter(
+            tuple_(Notification.created_at, Notification.id) < tuple_(before_created_at, before_id)
+        )
+    else:
+        query = query.offset((page - 1) * page_size)
+    notifications = query.limit(page_size).all()
     
     return NotificationListResponse(
         notifications=notifications,
@@ -50,10 +67,10 @@ def get_unread_count(
     Get count of unread notifications.
     Optimized query using index.
     """
-    count = db.query(Notification).filter(
+    count = db.query(func.count(Notification.id)).filter(
         Notification.recipient_user_id == current_user.id,
         Notification.read_status == "Unread"
-    ).count()
+    ).scalar()
     
     return UnreadCountResponse(unread_count=count)
 
@@ -88,11 +105,17 @@ def mark_all_as_read(
     """
     Mark ALL unread notifications as Read for current user.
     """
-    # Bulk update for efficiency
-    db.query(Notification).filter(
-        Notification.recipient_user_id == current_user.id,
-        Notification.read_status == "Unread"
-    ).update({Notification.read_status: "Read"}, synchronize_session=False)
+    # Bulk update for efficiency: a Core UPDATE skips ORM session synchronization
+    # and the matched-row bookkeeping we never report back.
+    db.execute(
+        update(Notification)
+        .where(
+            Notification.recipient_user_id == current_user.id,
+            Notification.read_status == "Unread"
+        )
+        .values(read_status="Read")
+        .execution_options(synchronize_session=False)
+    )
     
     db.commit()
     
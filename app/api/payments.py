@@ -167,7 +167,7 @@ def list_payments(
     )
 
     query = db.query(Payment).filter(*conditions)
-    total = query.count()
+    total = query.with_entities(func.count(Payment.id)).scalar()
     payments = (
         query.order_by(Payment.payment_date.desc(), Payment.created_at.desc())
         .offset((page - 1) * page_size)
@@ -102,6 +102,9 @@ async def ws_presence(websocket: WebSocket):
                 for u in all_users
             ],
         }
+        # The socket may stay open for hours; hand the pooled connection back now
+        # instead of holding it idle-in-transaction for the socket's lifetime.
+        db.close()
         await websocket.send_json(snapshot)
 
         while True:
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import func, or_
 from typing import Optional
 
 from app.core.database import get_db
@@ -150,7 +150,7 @@ def list_projects(
     if name_search:
         query = query.filter(Project.name.ilike(f"%{name_search}%"))
     
-    total = query.count()
+    total = query.with_entities(func.count(Project.id)).scalar()
     projects = query.order_by(Project.start_date.desc()).offset((page - 1) * page_size).limit(page_size).all()
     
     return ProjectListResponse(
@@ -1,13 +1,11 @@
-import uuid
-from pathlib import Path
+import secrets
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
+from sqlalchemy import exists, func, or_, and_
 from typing import Optional, List, Dict, Any
 from datetime import date, datetime, timezone
 
-from app.core.config import settings
 from app.core.database import get_db
 from app.core.deps import get_current_user
 from app.models.user import User
@@ -25,14 +23,10 @@ from app.schemas.task import (
 from app.schemas.task_comment import TaskCommentCreate, TaskCommentResponse
 from app.utils.activity_logger import log_activity
 from app.utils.notification_service import create_notification
+from app.utils.uploads import UPLOAD_DIR, save_upload
 
 MAX_TASK_ATTACHMENT_SIZE = 100 * 1024 * 1024
-
-
-def _ensure_upload_dir() -> Path:
-    upload_dir = Path(settings.UPLOAD_DIR)
-    upload_dir.mkdir(parents=True, exist_ok=True)
-    return upload_dir
+TASK_ATTACHMENT_TOO_LARGE_DETAIL = f"File size exceeds maximum allowed size of {MAX_TASK_ATTACHMENT_SIZE / (1024 * 1024)}MB"
 
 # Strict Status Transitions (PRD Phase 8)
 VALID_TRANSITIONS = {
@@ -70,6 +64,12 @@ def _task_snapshot(task: Task) -> Dict[str, Any]:
     }
 
 
+def _department_exists(db: Session, name: str) -> bool:
+    # Checked against the table on every write: department changes on other workers
+    # must be visible immediately, which a process-local cache cannot guarantee.
+    return db.query(exists().where(Department.name == name)).scalar()
+
+
 def build_visibility_filter(current_user: User, db: Session):
     """Build SQLAlchemy filter for task visibility."""
     if current_user.user_type == "Admin":
@@ -118,8 +118,7 @@ def create_task(
             detail="Company not found"
         )
     
-    dept = db.query(Department).filter(Department.name == task_data.department).first()
-    if not dept:
+    if not _department_exists(db, task_data.department):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Department '{task_data.department}' does not exist"
@@ -239,7 +238,7 @@ def list_tasks(
     if assigned_user_filter:
         query = query.filter(Task.assigned_user_id == assigned_user_filter)
     
-    total = query.count()
+    total = query.with_entities(func.count(Task.id)).scalar()
     tasks = query.order_by(Task.created_at.desc()).offset((page - 1) * page_size).limit(page_size).all()
     
     return TaskListResponse(
@@ -264,19 +263,14 @@ async def upload_task_document(
     if not can_user_view_task(task, current_user, db):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You do not have access to this task")
 
-    file_content = await file.read()
-    file_size = len(file_content)
-    if file_size > MAX_TASK_ATTACHMENT_SIZE:
-        raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail=f"File size exceeds maximum allowed size of {MAX_TASK_ATTACHMENT_SIZE / (1024 * 1024)}MB",
-        )
-
-    upload_dir = _ensure_upload_dir()
-    storage_filename = str(uuid.uuid4())
-    storage_path = upload_dir / storage_filename
-    with open(storage_path, "wb") as f:
-        f.write(file_content)
+    storage_filename = secrets.token_hex(16)
+    storage_path = UPLOAD_DIR / storage_filename
+    file_size = await save_upload(
+        file,
+        storage_path,
+        max_bytes=MAX_TASK_ATTACHMENT_SIZE,
+        too_large_detail=TASK_ATTACHMENT_TOO_LARGE_DETAIL,
+    )
 
     document = Document(
         filename=storage_filename,
@@ -437,7 +431,7 @@ def list_task_comments(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You do not have access to this task")
 
     rows = (
-        db.query(TaskComment, User)
+        db.query(TaskComment, User.first_name, User.last_name)
         .join(User, TaskComment.user_id == User.id)
         .filter(TaskComment.task_id == task.id)
         .order_by(TaskComment.created_at.asc())
@@ -449,11 +443,11 @@ def list_task_comments(
             id=comment.id,
             task_id=comment.task_id,
             user_id=comment.user_id,
-            user_full_name=f"{user.first_name} {user.last_name}".strip(),
+            user_full_name=f"{first_name} {last_name}".strip(),
             body=comment.body,
             created_at=comment.created_at,
         )
-        for comment, user in rows
+        for comment, first_name, last_name in rows
     ]
 
 
@@ -526,7 +520,7 @@ def list_deleted_tasks(
         )
 
     query = db.query(Task).filter(Task.deleted_at.isnot(None))
-    total = query.count()
+    total = query.with_entities(func.count(Task.id)).scalar()
     tasks = query.order_by(Task.deleted_at.desc()).offset((page - 1) * page_size).limit(page_size).all()
 
     return TaskListResponse(
@@ -695,8 +689,7 @@ def update_task(
                 )
             task.company_id = task_data.company_id
         if task_data.department is not None:
-            dept = db.query(Department).filter(Department.name == task_data.department).first()
-            if not dept:
+            if not _department_exists(db, task_data.department):
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"Department '{task_data.department}' does not exist"
@@ -924,13 +917,27 @@ def transfer_task(
     Only "Not Urgent & Not Important" tasks can be transferred.
     Can only transfer to subordinates.
     """
-    task = db.query(Task).filter(Task.id == task_id, Task.deleted_at.is_(None)).first()
+    # Task, new-assignee existence and the subordinate check in one round-trip.
+    new_assigned_user_id = transfer_data.new_assigned_user_id
+    row = (
+        db.query(
+            Task,
+            exists().where(User.id == new_assigned_user_id).label("new_user_exists"),
+            exists().where(
+                User.id == new_assigned_user_id,
+                User.manager_id == current_user.id,
+            ).label("is_subordinate"),
+        )
+        .filter(Task.id == task_id, Task.deleted_at.is_(None))
+        .first()
+    )
     
-    if not task:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Task not found"
         )
+    task = row.Task
     
     if str(task.owner_user_id) != str(current_user.id):
         raise HTTPException(
@@ -944,8 +951,7 @@ def transfer_task(
             detail="Only 'Not Urgent & Not Important' tasks can be transferred"
         )
     
-    new_user = db.query(User).filter(User.id == transfer_data.new_assigned_user_id).first()
-    if not new_user:
+    if not row.new_user_exists:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="New assigned user not found"
@@ -954,8 +960,7 @@ def transfer_task(
     # Strict Transfer Logic (Phase 8)
     
     # 1. New assignee must be a subordinate (already checked below, but ensuring logic flow)
-    subordinate_ids = get_subordinate_ids(current_user, db)
-    if str(transfer_data.new_assigned_user_id) not in subordinate_ids:
+    if not row.is_subordinate:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Can only transfer tasks to subordinates"
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import delete, exists, or_
 from typing import List
 
 from app.core.database import get_db
@@ -23,13 +23,19 @@ def is_team_member_or_admin(team_id: str, current_user: User, db: Session) -> bo
     if current_user.user_type == "Admin":
         return True
     
-    # Check if user is a member of this team
-    member = db.query(TeamMember).filter(
-        TeamMember.team_id == team_id,
-        TeamMember.user_id == current_user.id
-    ).first()
-    
-    return member is not None
+    # Check if user is a member of this team (EXISTS; no TeamMember is loaded)
+    return db.query(
+        exists().where(
+            TeamMember.team_id == team_id,
+            TeamMember.user_id == current_user.id
+        )
+    ).scalar()
+
+
+def team_member_responses(team_id: str, db: Session) -> List[TeamMemberResponse]:
+    """Member entries for a team response, read as columns rather than TeamMember rows."""
+    rows = db.query(TeamMember.user_id, TeamMember.role).filter(TeamMember.team_id == team_id).all()
+    return [TeamMemberResponse(user_id=user_id, role=role) for user_id, role in rows]
 
 
 @router.post("", response_model=TeamResponse, status_code=status.HTTP_201_CREATED, dependencies=[Depends(require_admin)])
@@ -78,15 +84,17 @@ def create_team(
     )
     db.add(head_member)
     
-    # Add other members
+    # Add other members (existence of every requested user checked in one query)
+    found_member_ids = {
+        row[0] for row in db.query(User.id).filter(User.id.in_(team_data.member_ids)).all()
+    } if team_data.member_ids else set()
     for member_id in team_data.member_ids:
         # Skip if it's the head (already added)
         if str(member_id) == str(team_data.head_user_id):
             continue
         
         # Verify user exists
-        user = db.query(User).filter(User.id == member_id).first()
-        if not user:
+        if member_id not in found_member_ids:
             db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -104,9 +112,8 @@ def create_team(
     db.refresh(team)
     
     # Load members for response
-    members = db.query(TeamMember).filter(TeamMember.team_id == team.id).all()
     team_response = TeamResponse.model_validate(team)
-    team_response.members = [TeamMemberResponse(user_id=m.user_id, role=m.role) for m in members]
+    team_response.members = team_member_responses(team.id, db)
     
     return team_response
 
@@ -136,19 +143,23 @@ def list_teams(
     # Apply pagination
     teams = query.order_by(Team.name).offset((page - 1) * page_size).limit(page_size).all()
     
-    # Load members for all returned teams in one query to avoid N+1.
+    # Load members for all returned teams in one query to avoid N+1. Only the two
+    # response columns are selected, so no TeamMember objects are hydrated.
     team_ids = [team.id for team in teams]
     members_by_team = {team_id: [] for team_id in team_ids}
     if team_ids:
-        members = db.query(TeamMember).filter(TeamMember.team_id.in_(team_ids)).all()
-        for member in members:
-            members_by_team.setdefault(member.team_id, []).append(member)
+        rows = (
+            db.query(TeamMember.team_id, TeamMember.user_id, TeamMember.role)
+            .filter(TeamMember.team_id.in_(team_ids))
+            .all()
+        )
+        for team_id, user_id, role in rows:
+            members_by_team[team_id].append(TeamMemberResponse(user_id=user_id, role=role))
 
     team_responses = []
     for team in teams:
-        team_members = members_by_team.get(team.id, [])
         team_response = TeamResponse.model_validate(team)
-        team_response.members = [TeamMemberResponse(user_id=m.user_id, role=m.role) for m in team_members]
+        team_response.members = members_by_team[team.id]
         team_responses.append(team_response)
     
     return TeamListResponse(
@@ -178,17 +189,18 @@ def get_team(
             detail="Team not found"
         )
     
-    # Check if user has access
-    if not is_team_member_or_admin(team_id, current_user, db):
+    # The member list is needed for the response anyway, so it also answers the
+    # access check instead of a separate membership query.
+    members = team_member_responses(team.id, db)
+    is_member = any(member.user_id == current_user.id for member in members)
+    if current_user.user_type != "Admin" and not is_member:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You do not have access to this team"
         )
     
-    # Load members
-    members = db.query(TeamMember).filter(TeamMember.team_id == team.id).all()
     team_response = TeamResponse.model_validate(team)
-    team_response.members = [TeamMemberResponse(user_id=m.user_id, role=m.role) for m in members]
+    team_response.members = members
     
     return team_response
 
@@ -277,9 +289,8 @@ def update_team(
     db.refresh(team)
     
     # Load members
-    members = db.query(TeamMember).filter(TeamMember.team_id == team.id).all()
     team_response = TeamResponse.model_validate(team)
-    team_response.members = [TeamMemberResponse(user_id=m.user_id, role=m.role) for m in members]
+    team_response.members = team_member_responses(team.id, db)
     
     return team_response
 
@@ -312,22 +323,27 @@ def add_team_members(
     added_count = 0
     skipped_count = 0
     
+    # Resolve requested users and their current memberships up front: two queries total
+    found_user_ids = {
+        row[0] for row in db.query(User.id).filter(User.id.in_(members_data.user_ids)).all()
+    }
+    member_user_ids = {
+        row[0] for row in db.query(TeamMember.user_id).filter(
+            TeamMember.team_id == team_id,
+            TeamMember.user_id.in_(members_data.user_ids)
+        ).all()
+    }
+    
     for user_id in members_data.user_ids:
         # Verify user exists
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
+        if user_id not in found_user_ids:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"User {user_id} not found"
             )
         
         # Check if already a member
-        existing = db.query(TeamMember).filter(
-            TeamMember.team_id == team_id,
-            TeamMember.user_id == user_id
-        ).first()
-        
-        if existing:
+        if user_id in member_user_ids:
             skipped_count += 1
             continue
         
@@ -338,6 +354,7 @@ def add_team_members(
             role="member"
         )
         db.add(member)
+        member_user_ids.add(user_id)
         added_count += 1
     
     db.commit()
@@ -382,19 +399,19 @@ def remove_team_member(
             detail="Cannot remove team head. Change the head first if needed."
         )
     
-    # Find and remove member
-    member = db.query(TeamMember).filter(
-        TeamMember.team_id == team_id,
-        TeamMember.user_id == user_id
-    ).first()
+    # Remove the member; RETURNING doubles as the membership check
+    removed = db.execute(
+        delete(TeamMember)
+        .where(TeamMember.team_id == team_id, TeamMember.user_id == user_id)
+        .returning(TeamMember.id)
+    ).scalar_one_or_none()
     
-    if not member:
+    if removed is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User is not a member of this team"
         )
     
-    db.delete(member)
     db.commit()
     
     return {"message": f"Member removed from team successfully"}
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy import or_
-from sqlalchemy.orm import Session
+from sqlalchemy import literal_column
+from sqlalchemy.orm import Session, load_only
 
 from app.core.database import get_db
 from app.core.deps import get_current_user
@@ -8,6 +8,13 @@ from app.models.user import User
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
+# Must render exactly as the expression of the ix_users_search_trgm GIN index
+# (migration 028) so leading-wildcard ILIKE is served by pg_trgm, not a seq scan.
+_SPACE = literal_column("' '")
+_USER_SEARCH_TEXT = (
+    User.first_name + _SPACE + User.last_name + _SPACE + User.username + _SPACE + User.email
+)
+
 
 @router.get("")
 def search_users(
@@ -18,17 +25,14 @@ def search_users(
 ):
     q = query.strip()
 
-    users_q = db.query(User).filter(User.is_active.is_(True), User.id != current_user.id)
+    users_q = (
+        db.query(User)
+        .options(load_only(User.id, User.first_name, User.last_name, User.username, User.email))
+        .filter(User.is_active.is_(True), User.id != current_user.id)
+    )
     if q:
         pattern = f"%{q}%"
-        users_q = users_q.filter(
-            or_(
-                User.first_name.ilike(pattern),
-                User.last_name.ilike(pattern),
-                User.username.ilike(pattern),
-                User.email.ilike(pattern),
-            )
-        )
+        users_q = users_q.filter(_USER_SEARCH_TEXT.ilike(pattern))
 
     users = users_q.order_by(User.first_name.asc(), User.last_name.asc(), User.username.asc()).limit(limit).all()
     return {
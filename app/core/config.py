@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Literal, Optional
 
 
 class Settings(BaseSettings):
@@ -7,6 +7,22 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str
+    # Sync engine: plain `def` endpoints, the bulk of the API.
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 5
+    # Async engine: the `async def` read endpoints.
+    DB_ASYNC_POOL_SIZE: int = 5
+    DB_ASYNC_MAX_OVERFLOW: int = 5
+    # Each worker may open up to DB_POOL_SIZE + DB_MAX_OVERFLOW + DB_ASYNC_POOL_SIZE
+    # + DB_ASYNC_MAX_OVERFLOW connections (25 by default); multiply by the worker count
+    # and keep the total under Postgres max_connections.
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    # Set when DATABASE_URL points at PgBouncer in transaction-pooling mode;
+    # disables asyncpg's server-side prepared statement caches.
+    DB_BEHIND_PGBOUNCER: bool = False
+    # Open and ping this many connections per engine at startup (0 disables).
+    DB_POOL_WARM_CONNECTIONS: int = 5
     
     # JWT Configuration
     JWT_SECRET_KEY: str
@@ -14,12 +30,33 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     REFRESH_TOKEN_EXPIRE_DAYS: int
     
+    # Password hashing
+    BCRYPT_ROUNDS: int = 12
+    # When set, pick the highest cost (10..BCRYPT_ROUNDS) whose hash time stays
+    # within this budget on the host, measured once at startup.
+    BCRYPT_TARGET_MS: Optional[int] = None
+    # Login, token refresh and admin password resets allowed per minute, per client IP
+    # and per account. Counted in process memory, so each worker enforces it separately.
+    LOGIN_RATE_LIMIT_PER_MINUTE: int = 10
+    # Comma-separated proxy addresses whose X-Forwarded-For is trusted when identifying the
+    # client for rate limiting ("*" trusts any peer). Behind a reverse proxy, list it here
+    # (or run uvicorn with --forwarded-allow-ips) or every client shares the proxy's bucket.
+    FORWARDED_ALLOW_IPS: str = "127.0.0.1"
+    
     # Application
     APP_NAME: str = "BWC Task Manager"
     DEBUG: bool = False
+    # Development aid: warn when a request issues more SQL statements than this,
+    # which usually means an N+1 loop (0 disables).
+    QUERY_COUNT_WARN_THRESHOLD: int = 0
     
     # File Upload
     UPLOAD_DIR: str = "./uploads"
+    # Let the reverse proxy send downloads from disk: "xaccel" (nginx X-Accel-Redirect)
+    # or "xsendfile" (Apache/lighttpd X-Sendfile). "none" serves them from the app.
+    DOWNLOAD_ACCEL_METHOD: Literal["none", "xaccel", "xsendfile"] = "none"
+    # nginx `internal` location aliased to UPLOAD_DIR; used with xaccel.
+    DOWNLOAD_ACCEL_PREFIX: str = "/_protected/"
     
     class Config:
         env_file = ".env"
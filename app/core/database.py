@@ -1,21 +1,97 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base, Session
 from sqlalchemy import Column, DateTime
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.types import TypeDecorator
 from datetime import datetime, timezone
+import json
 import uuid
-from typing import Generator
+from typing import Any, AsyncGenerator, Dict, Generator, Optional
 
 from app.core.config import settings
 
+# Pool behaviour shared by the sync and async engines. Each keeps its own pool, sized
+# separately below for its share of traffic.
+_POOL_OPTIONS = dict(
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=True,
+    # Hand out the most recently returned connection first: bursts reuse a few warm
+    # connections and the idle overflow ones age out through pool_recycle.
+    pool_use_lifo=True,
+)
+
 # Create SQLAlchemy engine
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,
-    echo=settings.DEBUG
+    echo=settings.DEBUG,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    **_POOL_OPTIONS
+)
+
+
+def _async_database_url(url: str) -> URL:
+    """Same database as DATABASE_URL, addressed through the asyncpg driver."""
+    async_url = make_url(url).set(drivername="postgresql+asyncpg")
+    # asyncpg spells libpq's sslmode as ssl.
+    if "sslmode" in async_url.query:
+        query = dict(async_url.query)
+        query["ssl"] = query.pop("sslmode")
+        async_url = async_url.set(query=query)
+    return async_url
+
+
+# Async engine for endpoints declared `async def`, so they await Postgres
+# instead of occupying a threadpool slot.
+async_engine = create_async_engine(
+    _async_database_url(settings.DATABASE_URL),
+    echo=settings.DEBUG,
+    connect_args=(
+        {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+        if settings.DB_BEHIND_PGBOUNCER
+        else {}
+    ),
+    pool_size=settings.DB_ASYNC_POOL_SIZE,
+    max_overflow=settings.DB_ASYNC_MAX_OVERFLOW,
+    **_POOL_OPTIONS
 )
 
 # Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False keeps committed attributes loaded so handlers can build
+# responses without a follow-up SELECT; server defaults come back via RETURNING.
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+def warm_pool(connections: int) -> None:
+    """Open and ping `connections` sync pool slots so early requests skip the connect handshake."""
+    opened = []
+    try:
+        for _ in range(connections):
+            conn = engine.connect()
+            opened.append(conn)
+            conn.execute(text("SELECT 1"))
+    finally:
+        for conn in opened:
+            conn.close()
+
+
+async def warm_async_pool(connections: int) -> None:
+    """Async-engine counterpart of warm_pool."""
+    opened = []
+    try:
+        for _ in range(connections):
+            conn = await async_engine.connect()
+            opened.append(conn)
+            await conn.execute(text("SELECT 1"))
+    finally:
+        for conn in opened:
+            await conn.close()
+
 
 # Create Base class for models
 Base = declarative_base()
@@ -29,6 +105,28 @@ class BaseModel(Base):
     updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
 
 
+class JSONObject(TypeDecorator):
+    """
+    JSON column that always loads as a dict (or None).
+
+    Rows written by legacy imports may hold a JSON-encoded string or a non-object
+    value; normalizing here means response code can treat the attribute as a dict.
+    """
+    impl = JSONB
+    cache_ok = True
+
+    def process_result_value(self, value: Any, dialect) -> Optional[Dict[str, Any]]:
+        if value is None or isinstance(value, dict):
+            return value
+        if isinstance(value, str):
+            try:
+                value = json.loads(value)
+            except ValueError:
+                return None
+            return value if isinstance(value, dict) else None
+        return None
+
+
 def get_db() -> Generator[Session, None, None]:
     """FastAPI dependency for database sessions."""
     db = SessionLocal()
@@ -36,3 +134,9 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """FastAPI dependency for async database sessions."""
+    async with AsyncSessionLocal() as db:
+        yield db
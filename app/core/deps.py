@@ -1,9 +1,11 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Optional
 
-from app.core.database import get_db
+from app.core.database import get_async_db, get_db
 from app.core.security import decode_token
 from app.models.user import User
 
@@ -11,18 +13,13 @@ from app.models.user import User
 security = HTTPBearer()
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
+def _validate_access_token(token: str) -> str:
     """
-    FastAPI dependency to get the current authenticated user from JWT token.
+    Decode and validate an access token, returning its subject user id.
     
     Raises:
-        HTTPException: If token is invalid or user not found
+        HTTPException: If the token is invalid, not an access token, or has no subject
     """
-    token = credentials.credentials
-    
     # Decode token
     payload = decode_token(token)
     if not payload:
@@ -40,7 +37,6 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Get user from database
     user_id = payload.get("sub")
     if not user_id:
         raise HTTPException(
@@ -49,7 +45,10 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user = db.query(User).filter(User.id == user_id).first()
+    return user_id
+
+
+def _ensure_active_user(user: Optional[User]) -> User:
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -67,6 +66,40 @@ def get_current_user(
     return user
 
 
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> User:
+    """
+    FastAPI dependency to get the current authenticated user from JWT token.
+    
+    Raises:
+        HTTPException: If token is invalid or user not found
+    """
+    user_id = _validate_access_token(credentials.credentials)
+    
+    # Get user from database (always re-read so deactivation takes effect immediately)
+    user = db.query(User).filter(User.id == user_id).first()
+    return _ensure_active_user(user)
+
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """
+    get_current_user for `async def` routes on get_async_db.
+    
+    FastAPI caches dependencies per request, so the user is loaded on the same
+    AsyncSession the route receives: no sync session, pooled connection or
+    threadpool slot is taken for authentication.
+    """
+    user_id = _validate_access_token(credentials.credentials)
+    
+    result = await db.execute(select(User).where(User.id == user_id))
+    return _ensure_active_user(result.scalars().first())
+
+
 def require_admin(current_user: User = Depends(get_current_user)) -> User:
     """
     FastAPI dependency to require admin privileges.
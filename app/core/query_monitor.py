@@ -0,0 +1,55 @@
+"""Per-request SQL statement counting, to surface N+1 query patterns during development."""
+import logging
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.database import async_engine, engine
+
+logger = logging.getLogger(__name__)
+
+# A mutable counter rather than an int: sync handlers run in a threadpool on a copy of the
+# request context, so they can bump the shared counter but not rebind the variable.
+_request_statements: ContextVar[Optional[list[int]]] = ContextVar("request_statements", default=None)
+
+
+def _count_statement(*_args) -> None:
+    counter = _request_statements.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+class QueryCountMiddleware:
+    """Log a warning for any HTTP request that issues more than `threshold` SQL statements."""
+
+    def __init__(self, app: ASGIApp, threshold: int) -> None:
+        self.app = app
+        self.threshold = threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        counter = [0]
+        token = _request_statements.set(counter)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_statements.reset(token)
+            if counter[0] > self.threshold:
+                logger.warning(
+                    "%s %s issued %d SQL statements (threshold %d); check for N+1 queries",
+                    scope["method"],
+                    scope["path"],
+                    counter[0],
+                    self.threshold,
+                )
+
+
+def install_query_counter(app, threshold: int) -> None:
+    for target in (engine, async_engine.sync_engine):
+        event.listen(target, "before_cursor_execute", _count_statement)
+    app.add_middleware(QueryCountMiddleware, threshold=threshold)
@@ -1,55 +1,166 @@
-from passlib.context import CryptContext
-from jose import JWTError, jwt
+import jwt
+from jwt import InvalidTokenError as JWTError
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, Any
-import uuid
+from typing import Callable, Optional, Dict, Any
+import asyncio
+import base64
+import bcrypt
+import hashlib
+import hmac
+import orjson
+import os
+import secrets
+import time
 
 from app.core.config import settings
+from app.utils.cache import TTLCache
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+BCRYPT_MIN_ROUNDS = 10
+
+
+def _calibrate_bcrypt_rounds(target_ms: int, max_rounds: int) -> int:
+    """Return the highest cost in [BCRYPT_MIN_ROUNDS, max_rounds] that hashes within target_ms."""
+    chosen = BCRYPT_MIN_ROUNDS
+    for rounds in range(BCRYPT_MIN_ROUNDS, max_rounds + 1):
+        started = time.perf_counter()
+        bcrypt.hashpw(b"calibration", bcrypt.gensalt(rounds=rounds))
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if elapsed_ms > target_ms:
+            break
+        chosen = rounds
+    return chosen
+
+
+# bcrypt cost factor for new hashes, frozen for the process. Existing hashes carry
+# their own cost and keep verifying regardless of this value.
+if settings.BCRYPT_TARGET_MS:
+    BCRYPT_ROUNDS = _calibrate_bcrypt_rounds(settings.BCRYPT_TARGET_MS, max(settings.BCRYPT_ROUNDS, BCRYPT_MIN_ROUNDS))
+else:
+    BCRYPT_ROUNDS = settings.BCRYPT_ROUNDS
+
+# Dedicated pool for bcrypt so slow hashes never occupy the shared AnyIO threadpool
+# that serves sync endpoints. The bcrypt C extension releases the GIL, so threads
+# scale across cores without the pickling cost of a process pool.
+_password_executor = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 1,
+    thread_name_prefix="bcrypt",
+)
 
 
 def hash_password(password: str) -> str:
     """Hash a password using bcrypt."""
-    return pwd_context.hash(password)
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode("utf-8")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    try:
+        return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
+    except ValueError:
+        # Malformed or non-bcrypt hash stored for this user.
+        return False
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the bcrypt executor without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, verify_password, plain_password, hashed_password)
+
+
+# blake2b(token) -> verified claims; bounded, and entries never outlive the token's exp.
+VERIFIED_CLAIMS_TTL_SECONDS = 300
+_verified_claims = TTLCache(ttl_seconds=VERIFIED_CLAIMS_TTL_SECONDS, max_entries=10_000)
+
+
+_JWT_HMAC_DIGESTS = {
+    "HS256": hashlib.sha256,
+    "HS384": hashlib.sha384,
+    "HS512": hashlib.sha512,
+}
+
+
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _build_jwt_encoder(secret: str, algorithm: str) -> Callable[[Dict[str, Any]], str]:
+    """Freeze the signing key and algorithm into a JWT encoder.
+
+    For HMAC algorithms the header segment and the keyed HMAC state are computed once,
+    so each token only hashes its own claims. Other algorithms go through PyJWT.
+    """
+    digestmod = _JWT_HMAC_DIGESTS.get(algorithm)
+    if digestmod is None:
+        return lambda claims: jwt.encode(claims, secret, algorithm=algorithm)
+
+    header_b64 = _b64url(orjson.dumps({"alg": algorithm, "typ": "JWT"}))
+    keyed_mac = hmac.new(secret.encode("utf-8"), digestmod=digestmod)
+
+    def encode(claims: Dict[str, Any]) -> str:
+        signing_input = header_b64 + b"." + _b64url(orjson.dumps(claims))
+        mac = keyed_mac.copy()
+        mac.update(signing_input)
+        return (signing_input + b"." + _b64url(mac.digest())).decode("ascii")
+
+    return encode
+
+
+_encode_jwt = _build_jwt_encoder(settings.JWT_SECRET_KEY, settings.JWT_ALGORITHM)
+
+# Token settings resolved once at import rather than on every issue/verify call.
+_JWT_ALGORITHMS = [settings.JWT_ALGORITHM]
+_REFRESH_TOKEN_HASH_KEY = settings.JWT_SECRET_KEY.encode("utf-8")
+ACCESS_TOKEN_LIFETIME = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+REFRESH_TOKEN_LIFETIME = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
 
 
 def create_access_token(data: Dict[str, Any]) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    expire = datetime.now(timezone.utc) + ACCESS_TOKEN_LIFETIME
     to_encode.update({
-        "exp": expire,
+        "exp": int(expire.timestamp()),
         "type": "access",
-        "jti": str(uuid.uuid4()) # Add unique ID
+        "jti": secrets.token_hex(16) # Add unique ID
     })
-    encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
-    return encoded_jwt
+    return _encode_jwt(to_encode)
 
 
 def create_refresh_token(data: Dict[str, Any]) -> str:
     """Create a JWT refresh token."""
     to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    expire = datetime.now(timezone.utc) + REFRESH_TOKEN_LIFETIME
     to_encode.update({
-        "exp": expire,
+        "exp": int(expire.timestamp()),
         "type": "refresh",
-        "jti": str(uuid.uuid4()) # Add unique ID
+        "jti": secrets.token_hex(16) # Add unique ID
     })
-    encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
-    return encoded_jwt
+    return _encode_jwt(to_encode)
+
+
+def hash_refresh_token(token: str) -> bytes:
+    """Return the keyed digest under which a refresh token is stored and looked up."""
+    return hmac.digest(_REFRESH_TOKEN_HASH_KEY, token.encode("utf-8"), "sha256")
 
 
 def decode_token(token: str) -> Optional[Dict[str, Any]]:
     """Decode and verify a JWT token."""
+    # Verified claims are memoized by a digest of the token itself, so a token seen
+    # before only needs its expiry re-checked instead of a full signature verification.
+    key = hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+    cached = _verified_claims.get(key)
+    if cached is not None:
+        if cached.get("exp", 0) <= time.time():
+            return None
+        return dict(cached)
+
     try:
-        payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
-        return payload
+        payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=_JWT_ALGORITHMS)
     except JWTError:
         return None
+
+    ttl = min(VERIFIED_CLAIMS_TTL_SECONDS, payload.get("exp", 0) - time.time())
+    if ttl > 0:
+        _verified_claims.set(key, dict(payload), ttl_seconds=ttl)
+    return payload
@@ -1,10 +1,12 @@
+import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.auth import router as auth_router
 from app.api.admin_users import router as admin_users_router
-from app.api.companies import router as companies_router
+from app.api.companies import load_existing_tables, router as companies_router
 from app.api.admin_departments import router as admin_departments_router
 from app.api.teams import router as teams_router
 from app.api.tasks import router as tasks_router
@@ -29,11 +31,37 @@ from app.services.daily_call_reminder_service import (
     stop_daily_call_reminder_loop,
 )
 from app.services.retention_jobs import start_retention_scheduler, stop_retention_scheduler
+from app.utils.uploads import ensure_upload_dir
 from app.core.config import settings
+from app.core.database import async_engine, warm_async_pool, warm_pool
+from app.core.query_monitor import install_query_counter
+
+
+logger = logging.getLogger(__name__)
+
+
+async def _warm_connection_pools() -> None:
+    warm = min(settings.DB_POOL_WARM_CONNECTIONS, settings.DB_POOL_SIZE)
+    async_warm = min(settings.DB_POOL_WARM_CONNECTIONS, settings.DB_ASYNC_POOL_SIZE)
+    try:
+        if warm > 0:
+            await run_in_threadpool(warm_pool, warm)
+        if async_warm > 0:
+            await warm_async_pool(async_warm)
+    except Exception:
+        # A cold pool only costs latency; the app still starts if the database is slow to come up.
+        logger.warning("Connection pool warm-up failed", exc_info=True)
 
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
+    ensure_upload_dir()
+    await _warm_connection_pools()
+    try:
+        await run_in_threadpool(load_existing_tables)
+    except Exception:
+        # Resolved lazily on first use instead.
+        logger.warning("Schema table lookup failed at startup", exc_info=True)
     start_daily_call_reminder_loop()
     start_retention_scheduler()
     try:
@@ -41,6 +69,7 @@ async def lifespan(_: FastAPI):
     finally:
         stop_retention_scheduler()
         stop_daily_call_reminder_loop()
+        await async_engine.dispose()
 
 
 # Create FastAPI application
@@ -61,6 +90,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.QUERY_COUNT_WARN_THRESHOLD > 0:
+    install_query_counter(app, settings.QUERY_COUNT_WARN_THRESHOLD)
+
 # Register routers
 app.include_router(auth_router)
 app.include_router(admin_users_router)
@@ -86,18 +118,24 @@ app.include_router(users_router)
 app.include_router(departments_router)
 
 
+# Static payloads: built once, and served from coroutines so probes never wait on a
+# threadpool slot.
+_ROOT_RESPONSE = {
+    "message": "BWC Task Manager API",
+    "version": "1.0.0",
+    "status": "running"
+}
+_HEALTH_RESPONSE = {"status": "healthy"}
+
+
 @app.get("/")
-def root():
+async def root():
     """Root endpoint."""
-    return {
-        "message": "BWC Task Manager API",
-        "version": "1.0.0",
-        "status": "running"
-    }
+    return _ROOT_RESPONSE
 
 
 @app.get("/health")
-def health_check():
+async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy"}
+    return _HEALTH_RESPONSE
 
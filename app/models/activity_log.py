@@ -1,10 +1,10 @@
 from sqlalchemy import Column, String, ForeignKey, DateTime, JSON, Text
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 import uuid
 
-from app.core.database import BaseModel
+from app.core.database import BaseModel, JSONObject
 
 class ActivityLog(BaseModel):
     """
@@ -22,11 +22,11 @@ class ActivityLog(BaseModel):
     performed_by_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="RESTRICT"), nullable=False, index=True)
     
     # State snapshots (REDACTED secrets)
-    # Using JSONB for Postgres performance
-    old_value = Column(JSONB, nullable=True)
-    new_value = Column(JSONB, nullable=True)
+    # JSONB for Postgres performance; always loaded as a dict (see JSONObject)
+    old_value = Column(JSONObject, nullable=True)
+    new_value = Column(JSONObject, nullable=True)
     
-    created_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc), nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False, index=True)
 
     # Relationship to user
     performed_by = relationship("User", foreign_keys=[performed_by_user_id])
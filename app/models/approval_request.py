@@ -50,6 +50,10 @@ class ApprovalRequest(Base):
         nullable=False,
     )
 
+    # Fetch server-generated id/created_at via RETURNING on INSERT so responses
+    # can be built without refreshing the row.
+    __mapper_args__ = {"eager_defaults": True}
+
     __table_args__ = (
         CheckConstraint(
             f"request_type IN ({', '.join([repr(v) for v in REQUEST_TYPE_VALUES])})",
@@ -12,7 +12,8 @@ class UserAuditLog(Base):
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     admin_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="RESTRICT"), nullable=False, index=True)
-    target_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="RESTRICT"), nullable=False, index=True)
+    # Nulled when the target user is deleted; the delete_user entry keeps their identity in before_json.
+    target_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
     action = Column(String, nullable=False)
     before_json = Column(JSON, nullable=True)
     after_json = Column(JSON, nullable=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, UUID, DateTime
+from sqlalchemy import Column, LargeBinary, ForeignKey, UUID, DateTime
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone, timedelta
 import uuid
@@ -13,7 +13,8 @@ class AuthRefreshToken(Base):
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="RESTRICT"), nullable=False, index=True)
-    token = Column(String, unique=True, nullable=False, index=True)
+    # HMAC-SHA256 of the issued token; the token itself is never stored.
+    token_hash = Column(LargeBinary(32), unique=True, nullable=False, index=True)
     expires_at = Column(DateTime(timezone=True), nullable=False)
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
     
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 import sqlalchemy as sa
-from sqlalchemy import Boolean, Column, DateTime, String, Text
+from sqlalchemy import Boolean, CheckConstraint, Column, DateTime, Index, String, Text
 from sqlalchemy.dialects.postgresql import UUID
 
 from app.core.database import Base
 
 
+CHAT_APPROVAL_STATUS_VALUES = ("pending", "approved", "declined")
+
+
 class ChatMessage(Base):
     __tablename__ = "chat_messages"
 
@@ -56,3 +59,14 @@ class ChatMessage(Base):
         nullable=False,
     )
 
+    # Fetch server-generated id/created_at via RETURNING on INSERT so responses
+    # can be built without refreshing the row.
+    __mapper_args__ = {"eager_defaults": True}
+
+    __table_args__ = (
+        CheckConstraint(
+            f"approval_status IS NULL OR approval_status IN ({', '.join([repr(v) for v in CHAT_APPROVAL_STATUS_VALUES])})",
+            name="ck_chat_messages_approval_status_valid",
+        ),
+        Index("ix_chat_messages_thread_created", "thread_id", "created_at"),
+    )
@@ -44,6 +44,20 @@ class ChatThread(Base):
         server_default=sa.text("NOW()"),
         nullable=False,
     )
-
-    __table_args__ = ()
+    # Denormalized from chat_messages; set in the same transaction as each message insert.
+    last_message_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Fetch server-generated id/created_at in the INSERT's RETURNING clause.
+    __mapper_args__ = {"eager_defaults": True}
+
+    __table_args__ = (
+        # One direct thread per normalized (min, max) user pair; group threads are exempt.
+        sa.Index(
+            "uq_chat_threads_direct_pair",
+            "user_one_id",
+            "user_two_id",
+            unique=True,
+            postgresql_where=sa.text("NOT is_group"),
+        ),
+    )
 
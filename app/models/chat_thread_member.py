@@ -9,6 +9,10 @@ from app.core.database import Base
 
 class ChatThreadMember(Base):
     __tablename__ = "chat_thread_members"
+    __table_args__ = (
+        # Membership probe run before every thread read/write: (thread_id, user_id).
+        sa.Index("ix_chat_thread_members_thread_user", "thread_id", "user_id"),
+    )
 
     id = Column(
         UUID(as_uuid=True),
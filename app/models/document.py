@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, UUID, DateTime, Text, ForeignKey, BigInteger
+from sqlalchemy import Column, String, UUID, DateTime, Text, ForeignKey, BigInteger, Index
 from datetime import datetime, timezone
 import uuid
 
@@ -16,3 +16,8 @@ class Document(BaseModel):
     mime_type = Column(Text, nullable=False)
     storage_path = Column(Text, nullable=False)
     uploaded_by_user_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='RESTRICT'), nullable=False)
+
+    __table_args__ = (
+        # List order and keyset pagination (created_at DESC, id DESC) via a backward scan
+        Index("ix_documents_created_id", "created_at", "id"),
+    )
@@ -31,7 +31,7 @@ class Notification(Base):
     notification_type = Column(String, nullable=False)
     
     # 4. UTC Timestamp
-    created_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc), nullable=False)
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
 
     # Relationships
     recipient = relationship("User", foreign_keys=[recipient_user_id])
@@ -50,4 +50,8 @@ class Notification(Base):
         Index("ix_notifications_recipient_read", "recipient_user_id", "read_status"), # For Count Efficiency
         Index("ix_notifications_actor_user_id", "actor_user_id"),
         Index("ix_notifications_created_at", "created_at"),
+        Index(
+            "ix_notifications_recipient_created_id",
+            "recipient_user_id", created_at.desc(), id.desc(),
+        ), # For keyset pagination
     )
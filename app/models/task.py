@@ -37,4 +37,10 @@ class Task(BaseModel):
         ),
         Index("ix_tasks_company_id", "company_id"),
         Index("ix_tasks_deadline", "deadline"),
+        # Team-assigned tasks for visibility checks; only live (not soft-deleted) rows
+        Index("ix_tasks_team_active", "assigned_team_id", postgresql_where=deleted_at.is_(None)),
+        # Completion timeline in analytics: completed tasks ranged on updated_at
+        Index("ix_tasks_completed_updated_at", "updated_at", postgresql_where=status == "Completed"),
+        # Open-task counts per company (analytics tasks-per-company)
+        Index("ix_tasks_company_open", "company_id", postgresql_where=status != "Completed"),
     )
@@ -15,8 +15,8 @@ class User(BaseModel):
     first_name = Column(String, nullable=False)
     last_name = Column(String, nullable=False)
     hashed_password = Column(String, nullable=False)
-    user_type = Column(String, nullable=False)  # VARCHAR, not enum - validated at application level
-    is_active = Column(Boolean, default=True, nullable=False)
+    user_type = Column(String, nullable=False, index=True)  # VARCHAR, not enum - validated at application level
+    is_active = Column(Boolean, default=True, nullable=False, index=True)
     force_password_change = Column(Boolean, default=True, nullable=False)
     
     # Hierarchy: self-referential foreign key
@@ -27,5 +27,5 @@ class User(BaseModel):
     page_permissions = relationship("UserPagePermission", back_populates="user", cascade="all, delete-orphan")
     refresh_tokens = relationship("AuthRefreshToken", back_populates="user", cascade="all, delete-orphan")
     audit_logs_as_admin = relationship("UserAuditLog", foreign_keys="UserAuditLog.admin_user_id", back_populates="admin_user")
-    audit_logs_as_target = relationship("UserAuditLog", foreign_keys="UserAuditLog.target_user_id", back_populates="target_user")
+    audit_logs_as_target = relationship("UserAuditLog", foreign_keys="UserAuditLog.target_user_id", back_populates="target_user", passive_deletes=True)
     task_comments = relationship("TaskComment", back_populates="user")
@@ -7,16 +7,39 @@ from app.core.deps import get_current_user, require_admin
 from app.models.department import Department
 from app.models.user import User
 from app.schemas.department import DepartmentCreate, DepartmentResponse
+from app.utils.cache import TTLCache
 
 router = APIRouter(prefix="/departments", tags=["Departments"])
 
+# The department dropdown is polled often and changes rarely. Writes in this process
+# invalidate it; other workers pick changes up within the TTL.
+DEPARTMENT_LIST_CACHE_TTL_SECONDS = 60
+_DEPARTMENT_LIST_KEY = "departments"
+_department_list_cache = TTLCache(ttl_seconds=DEPARTMENT_LIST_CACHE_TTL_SECONDS)
+
+
+def invalidate_department_list_cache() -> None:
+    _department_list_cache.delete(_DEPARTMENT_LIST_KEY)
+
 
 @router.get("", response_model=list[DepartmentResponse])
 def list_departments(
     db: Session = Depends(get_db),
     _: User = Depends(get_current_user),
 ):
-    return db.query(Department).order_by(Department.name.asc()).all()
+    departments = _department_list_cache.get(_DEPARTMENT_LIST_KEY)
+    if departments is None:
+        rows = (
+            db.query(Department.id, Department.name, Department.created_at)
+            .order_by(Department.name.asc())
+            .all()
+        )
+        departments = [
+            DepartmentResponse(id=row.id, name=row.name, created_at=row.created_at)
+            for row in rows
+        ]
+        _department_list_cache.set(_DEPARTMENT_LIST_KEY, departments)
+    return departments
 
 
 @router.post("", response_model=DepartmentResponse, status_code=status.HTTP_201_CREATED)
@@ -38,4 +61,5 @@ def create_department(
     db.add(department)
     db.commit()
     db.refresh(department)
+    invalidate_department_list_cache()
     return department
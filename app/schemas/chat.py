@@ -17,6 +17,7 @@ class ChatThreadResponse(BaseModel):
     is_group: bool
     group_name: Optional[str] = None
     created_at: datetime
+    last_message_at: Optional[datetime] = None
     members: List[ChatThreadMemberResponse]
 
 
@@ -35,6 +36,9 @@ class ChatMessageResponse(BaseModel):
     is_read: bool
     created_at: datetime
 
+    class Config:
+        from_attributes = True
+
 
 class ChatMessageListResponse(BaseModel):
     messages: List[ChatMessageResponse]
@@ -4,13 +4,12 @@ import time
 from datetime import datetime, timedelta, timezone
 from typing import Iterable, Set
 
-from sqlalchemy import and_
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session
 import uuid as uuid_lib
 
 from app.core.database import SessionLocal
 from app.models.daily_call import DailyCall
-from app.models.user import User
 from app.models.notification import Notification
 from app.schemas.notification import NotificationType
 
@@ -148,30 +147,17 @@ def run_daily_call_reminder_check_once() -> None:
         # Window to fetch candidates, then we do precise due-time checks.
         candidate_window = timedelta(minutes=2)
 
-        user_ids = [row[0] for row in db.query(User.id).all()]
-
-        def _candidates_for_offset(minutes: int, *, user_id) -> list[DailyCall]:
+        def _offset_window(minutes: int):
             target_next_call_at = now + timedelta(minutes=minutes)
-            start = target_next_call_at - candidate_window
-            end = target_next_call_at + candidate_window
-            return (
-                db.query(DailyCall)
-                .filter(
-                    and_(
-                        DailyCall.user_id == user_id,
-                        DailyCall.next_call_at >= start,
-                        DailyCall.next_call_at <= end,
-                    )
-                )
-                .all()
+            return and_(
+                DailyCall.next_call_at >= target_next_call_at - candidate_window,
+                DailyCall.next_call_at <= target_next_call_at + candidate_window,
             )
 
-        for user_id in user_ids:
-            for daily_call in _candidates_for_offset(30, user_id=user_id):
-                ensure_daily_call_reminders_for_daily_call(db, daily_call, now)
-
-            for daily_call in _candidates_for_offset(5, user_id=user_id):
-                ensure_daily_call_reminders_for_daily_call(db, daily_call, now)
+        # Both reminder windows for every user in one query, rather than two per user.
+        candidates = db.query(DailyCall).filter(or_(_offset_window(30), _offset_window(5))).all()
+        for daily_call in candidates:
+            ensure_daily_call_reminders_for_daily_call(db, daily_call, now)
 
         db.commit()
     except Exception:
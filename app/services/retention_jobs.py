@@ -1,6 +1,6 @@
 import logging
-import os
 from datetime import datetime, timedelta, timezone
+from pathlib import Path
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from sqlalchemy import and_, or_
@@ -30,23 +30,35 @@ def cleanup_call_notes() -> None:
     file_delete_errors = 0
     try:
         now = _now_utc()
-        expired_links = db.query(CallNotesFile).filter(CallNotesFile.expires_at < now).all()
-
-        for link in expired_links:
-            doc = db.query(Document).filter(Document.id == link.file_id).first()
-            if doc:
-                try:
-                    if doc.storage_path and os.path.exists(doc.storage_path):
-                        os.remove(doc.storage_path)
-                except OSError:
-                    file_delete_errors += 1
-                    logger.exception("Failed deleting expired call-note file from disk")
-
-                db.delete(doc)
-                cleaned_docs += 1
+        expired_links = db.query(CallNotesFile.id, CallNotesFile.file_id).filter(CallNotesFile.expires_at < now).all()
+
+        # One lookup and one DELETE per table for the whole batch, not a round-trip per link.
+        link_ids = [link.id for link in expired_links]
+        file_ids = {link.file_id for link in expired_links}
+        docs = (
+            db.query(Document.id, Document.storage_path).filter(Document.id.in_(file_ids)).all()
+            if file_ids
+            else []
+        )
 
-            db.delete(link)
-            cleaned_links += 1
+        for doc in docs:
+            try:
+                if doc.storage_path:
+                    Path(doc.storage_path).unlink(missing_ok=True)
+            except OSError:
+                file_delete_errors += 1
+                logger.exception("Failed deleting expired call-note file from disk")
+
+        if link_ids:
+            cleaned_links = (
+                db.query(CallNotesFile).filter(CallNotesFile.id.in_(link_ids)).delete(synchronize_session=False)
+            )
+        if docs:
+            cleaned_docs = (
+                db.query(Document)
+                .filter(Document.id.in_([doc.id for doc in docs]))
+                .delete(synchronize_session=False)
+            )
 
         db.commit()
         logger.info(
@@ -69,7 +81,8 @@ def cleanup_events() -> None:
         now = _now_utc()
         cutoff = now - timedelta(days=3)
 
-        stale_events = (
+        # Single DELETE statement; nothing references events, so no ORM cascades are skipped.
+        hard_deleted = (
             db.query(Event)
             .filter(
                 and_(
@@ -80,13 +93,9 @@ def cleanup_events() -> None:
                     ),
                 )
             )
-            .all()
+            .delete(synchronize_session=False)
         )
 
-        for event in stale_events:
-            db.delete(event)
-            hard_deleted += 1
-
         db.commit()
         logger.info("Retention events cleanup finished: deleted=%s", hard_deleted)
     except Exception:
@@ -46,6 +46,9 @@ def create_audit_log(
     """
     Create an audit log entry for user management actions.
     
+    The entry is flushed, not committed: it joins the caller's transaction so the
+    change and its audit record are written together by the caller's commit.
+    
     Args:
         db: Database session
         admin_user_id: UUID of the admin performing the action
@@ -69,7 +72,6 @@ def create_audit_log(
     )
     
     db.add(audit_log)
-    db.commit()
-    db.refresh(audit_log)
+    db.flush()
     
     return audit_log
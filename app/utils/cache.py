@@ -2,14 +2,15 @@ from __future__ import annotations
 
 import time
 from threading import Lock
-from typing import Any, Dict, Hashable, Tuple
+from typing import Any, Dict, Hashable, Optional, Tuple
 
 
 class TTLCache:
     """Simple process-local in-memory TTL cache."""
 
-    def __init__(self, ttl_seconds: int = 60) -> None:
+    def __init__(self, ttl_seconds: int = 60, max_entries: Optional[int] = None) -> None:
         self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
         self._store: Dict[Hashable, Tuple[float, Any]] = {}
         self._lock = Lock()
 
@@ -25,7 +26,21 @@ class TTLCache:
                 return None
             return value
 
-    def set(self, key: Hashable, value: Any) -> None:
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        now = time.time()
+        with self._lock:
+            self._store[key] = (now + ttl, value)
+            if self.max_entries is not None and len(self._store) > self.max_entries:
+                self._evict(now)
+
+    def delete(self, key: Hashable) -> None:
         with self._lock:
-            self._store[key] = (time.time() + self.ttl_seconds, value)
+            self._store.pop(key, None)
 
+    def _evict(self, now: float) -> None:
+        # Drop expired entries first, then the oldest insertions until back under the bound.
+        for key in [k for k, (expires_at, _) in self._store.items() if expires_at <= now]:
+            del self._store[key]
+        while len(self._store) > self.max_entries:
+            del self._store[next(iter(self._store))]
@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, insert
 from datetime import datetime, timezone, timedelta
 from uuid import UUID
 from typing import List, Optional
@@ -26,7 +26,7 @@ def create_notification(
     Create notifications for multiple recipients with deduplication and visibility checks.
     
     STRICT RULES:
-    1. No commit (only db.add/db.add_all). Caller controls transaction.
+    1. No commit (rows are inserted in one statement). Caller controls transaction.
     2. Visibility check enforced.
     3. Deduplication:
        - Unique recipients only.
@@ -64,15 +64,16 @@ def create_notification(
         if not entity:
             return
 
-    final_notifications = []
-    
-    for recipient_id_str in unique_recipient_ids:
-        # We need the User object for visibility checks (permissions often depend on user attributes)
-        # Optimziation: We might fetch all users in one go if list is long, but loop is fine for small count.
-        recipient_user = db.query(User).get(recipient_id_str)
-        if not recipient_user:
-            continue
-            
+    # One clock read per call: every row created here shares the same timestamp.
+    now = datetime.now(timezone.utc)
+    duplicate_cutoff = now - timedelta(seconds=1)
+
+    # We need the User objects for visibility checks (permissions often depend on user attributes);
+    # fetch every recipient in one query instead of one lookup per recipient.
+    recipient_users = db.query(User).filter(User.id.in_(list(unique_recipient_ids))).all()
+
+    visible_recipient_ids = []
+    for recipient_user in recipient_users:
         can_view = False
         if entity_type == "Task":
             can_view = can_user_view_task(entity, recipient_user, db)
@@ -83,40 +84,48 @@ def create_notification(
             # For company: recipients are selected upstream and companies are global.
             can_view = True
         # Event/Document intentionally skipped for earlier phases.
-        
+
         if can_view:
-            duplicate_cutoff = datetime.now(timezone.utc) - timedelta(seconds=1)
-            existing_duplicate = (
-                db.query(Notification.id)
-                .filter(
-                    and_(
-                        Notification.recipient_user_id == recipient_id_str,
-                        Notification.entity_type == entity_type,
-                        Notification.entity_id == entity_id,
-                        Notification.notification_type == notification_type,
-                        Notification.title == title,
-                        Notification.message == message,
-                        Notification.created_at >= duplicate_cutoff,
-                    )
-                )
-                .first()
-            )
-            if existing_duplicate:
-                continue
+            visible_recipient_ids.append(recipient_user.id)
 
-            notif = Notification(
-                recipient_user_id=recipient_id_str,
-                actor_user_id=actor_id,
-                entity_type=entity_type,
-                entity_id=entity_id,
-                title=title,
-                message=message,
-                link=link,
-                notification_type=notification_type,
-                read_status="Unread"
+    if not visible_recipient_ids:
+        return
+
+    # Deduplication against identical notifications created in the last second, for all recipients at once.
+    duplicate_recipient_ids = {
+        row[0]
+        for row in db.query(Notification.recipient_user_id)
+        .filter(
+            and_(
+                Notification.recipient_user_id.in_(visible_recipient_ids),
+                Notification.entity_type == entity_type,
+                Notification.entity_id == entity_id,
+                Notification.notification_type == notification_type,
+                Notification.title == title,
+                Notification.message == message,
+                Notification.created_at >= duplicate_cutoff,
             )
-            final_notifications.append(notif)
-            
-    if final_notifications:
-        db.add_all(final_notifications)
-        # No db.commit()!
+        )
+        .all()
+    }
+
+    rows = [
+        {
+            "recipient_user_id": recipient_id,
+            "actor_user_id": actor_id,
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "title": title,
+            "message": message,
+            "link": link,
+            "notification_type": notification_type,
+            "read_status": "Unread",
+            "created_at": now,
+        }
+        for recipient_id in visible_recipient_ids
+        if recipient_id not in duplicate_recipient_ids
+    ]
+
+    if rows:
+        # Single multi-row INSERT inside the caller's transaction. No db.commit()!
+        db.execute(insert(Notification), rows)
@@ -4,6 +4,23 @@ from uuid import UUID
 
 from app.models.user import User
 from app.models.permission import UserPagePermission
+from app.utils.cache import TTLCache
+
+# Page rows are seeded by migrations and never renamed at runtime, so the
+# key -> id mapping is safe to memoize per process.
+PAGE_ID_CACHE_TTL_SECONDS = 300
+_page_ids = TTLCache(ttl_seconds=PAGE_ID_CACHE_TTL_SECONDS)
+
+
+def _get_page_id(db: Session, page_key: str) -> Optional[UUID]:
+    page_id = _page_ids.get(page_key)
+    if page_id is None:
+        from app.models.page import Page
+
+        page_id = db.query(Page.id).filter(Page.key == page_key).scalar()
+        if page_id is not None:
+            _page_ids.set(page_key, page_id)
+    return page_id
 
 
 def check_user_permission(db: Session, user: User, page_key: str) -> str:
@@ -28,19 +45,17 @@ def check_user_permission(db: Session, user: User, page_key: str) -> str:
         return "full"
     
     # Check explicit page permission
-    from app.models.page import Page
-    
-    page = db.query(Page).filter(Page.key == page_key).first()
-    if not page:
+    page_id = _get_page_id(db, page_key)
+    if page_id is None:
         return "none"
     
-    permission = db.query(UserPagePermission).filter(
+    access = db.query(UserPagePermission.access).filter(
         UserPagePermission.user_id == user.id,
-        UserPagePermission.page_id == page.id
-    ).first()
+        UserPagePermission.page_id == page_id
+    ).scalar()
     
-    if permission:
-        return permission.access
+    if access:
+        return access
     
     # Default to no access
     return "none"
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import time
+from threading import Lock
+from typing import Dict, Hashable, Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+
+from app.core.config import settings
+
+_TRUSTED_PROXIES = frozenset(ip.strip() for ip in settings.FORWARDED_ALLOW_IPS.split(",") if ip.strip())
+
+
+def _is_trusted_proxy(address: str) -> bool:
+    return "*" in _TRUSTED_PROXIES or address in _TRUSTED_PROXIES
+
+
+def client_ip(request: Request) -> str:
+    """
+    Address of the client that made the request, for rate-limit keys.
+
+    X-Forwarded-For is honoured only when the direct peer is a trusted proxy, and is read
+    from the nearest hop outwards so a client cannot spoof its way past the proxy.
+    """
+    peer = request.client.host if request.client else "unknown"
+    if not _is_trusted_proxy(peer):
+        return peer
+    hops = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not _is_trusted_proxy(hop):
+            return hop
+    return hops[0] if hops else peer
+
+
+class FixedWindowRateLimiter:
+    """Process-local fixed-window request counter keyed by an arbitrary hashable."""
+
+    def __init__(self, limit: int, window_seconds: int = 60, max_keys: Optional[int] = 10_000) -> None:
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.max_keys = max_keys
+        self._windows: Dict[Hashable, Tuple[float, int]] = {}
+        self._lock = Lock()
+
+    def hit(self, key: Hashable) -> Optional[int]:
+        """
+        Count one attempt for `key`.
+
+        Returns None when the attempt is allowed, otherwise the number of seconds
+        until the key's window resets.
+        """
+        now = time.time()
+        with self._lock:
+            window_start, count = self._windows.get(key, (now, 0))
+            if now - window_start >= self.window_seconds:
+                window_start, count = now, 0
+            if count >= self.limit:
+                return max(1, int(window_start + self.window_seconds - now) + 1)
+            self._windows[key] = (window_start, count + 1)
+            if self.max_keys is not None and len(self._windows) > self.max_keys:
+                self._evict(now)
+        return None
+
+    def _evict(self, now: float) -> None:
+        # Drop finished windows first, then the oldest keys until back under the bound.
+        for key in [k for k, (start, _) in self._windows.items() if now - start >= self.window_seconds]:
+            del self._windows[key]
+        while len(self._windows) > self.max_keys:
+            del self._windows[next(iter(self._windows))]
+
+
+def enforce_rate_limit(limiter: FixedWindowRateLimiter, *keys: Hashable, detail: str) -> None:
+    """Count one attempt against every key; respond 429 with Retry-After once any is exhausted."""
+    for key in keys:
+        retry_after = limiter.hit(key)
+        if retry_after is not None:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=detail,
+                headers={"Retry-After": str(retry_after)},
+            )
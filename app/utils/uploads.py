@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from fastapi import HTTPException, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+# Read size for streaming uploads; keeps peak memory per upload bounded.
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Per-call byte count for the kernel-side copy of spooled uploads.
+SENDFILE_CHUNK_SIZE = 1024 * 1024
+
+# Resolved once from settings; the directory itself is created at startup.
+UPLOAD_DIR = Path(settings.UPLOAD_DIR)
+
+
+def ensure_upload_dir() -> Path:
+    """Create the upload directory if needed. Called once from the app lifespan."""
+    UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    return UPLOAD_DIR
+
+
+def _is_on_disk(file: UploadFile) -> bool:
+    # Starlette spools uploads into a SpooledTemporaryFile; calling fileno() on one that
+    # is still in memory would force it to disk, so only use the fd once it has rolled over.
+    return hasattr(os, "sendfile") and getattr(file.file, "_rolled", True)
+
+
+def _sendfile_upload(src, destination: Path, max_bytes: int, too_large_detail: str) -> int:
+    src.seek(0)
+    in_fd = src.fileno()
+    written = 0
+    with open(destination, "wb") as out:
+        out_fd = out.fileno()
+        while sent := os.sendfile(out_fd, in_fd, None, SENDFILE_CHUNK_SIZE):
+            written += sent
+            if written > max_bytes:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=too_large_detail,
+                )
+    return written
+
+
+def _copy_upload(src, destination: Path, max_bytes: int, too_large_detail: str) -> int:
+    src.seek(0)
+    written = 0
+    with open(destination, "wb") as out:
+        while chunk := src.read(UPLOAD_CHUNK_SIZE):
+            written += len(chunk)
+            if written > max_bytes:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=too_large_detail,
+                )
+            out.write(chunk)
+    return written
+
+
+async def save_upload(file: UploadFile, destination: Path, max_bytes: int, too_large_detail: str) -> int:
+    """
+    Stream an uploaded file to `destination` chunk by chunk and return its size.
+
+    The upload is never held in memory as a whole. The byte count is checked as
+    chunks arrive; once it passes `max_bytes` the partial file is removed and a
+    413 is raised. Uploads already spooled to disk are copied with os.sendfile so
+    the bytes never pass through Python. All file I/O runs on the threadpool, so
+    the event loop is never blocked on disk.
+    """
+    # The multipart parser has already counted the bytes; reject before writing any.
+    if file.size is not None and file.size > max_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=too_large_detail,
+        )
+
+    try:
+        if _is_on_disk(file):
+            try:
+                return await run_in_threadpool(_sendfile_upload, file.file, destination, max_bytes, too_large_detail)
+            except OSError:
+                # File-to-file sendfile is Linux-only; fall back to the chunked copy.
+                pass
+        return await run_in_threadpool(_copy_upload, file.file, destination, max_bytes, too_large_detail)
+    except BaseException:
+        destination.unlink(missing_ok=True)
+        raise
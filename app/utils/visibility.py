@@ -6,8 +6,8 @@ from app.models.team_member import TeamMember
 
 def get_subordinate_ids(user: User, db: Session) -> list[str]:
     """Get list of subordinate user IDs for a manager."""
-    subordinates = db.query(User).filter(User.manager_id == user.id).all()
-    return [str(sub.id) for sub in subordinates]
+    rows = db.query(User.id).filter(User.manager_id == user.id).all()
+    return [str(row.id) for row in rows]
 
 def can_user_view_task(task: Task, current_user: User, db: Session) -> bool:
     """Check if user can view a task based on visibility rules."""